@@ -0,0 +1,784 @@
+"""
+Benchmark sederhana untuk konverter suhu.
+
+Contoh:
+    python Benchmark.py workers --rows 2000000 --max-workers 8
+    python Benchmark.py startup --repeat 20
+    python Benchmark.py import --repeat 10
+    python Benchmark.py auth-concurrency --clients 1 8 64
+    python Benchmark.py http --connections 8 --depth 32 --duration 5
+    python Benchmark.py cache --rows 1000000
+    python Benchmark.py exact --rows 200000
+    python Benchmark.py chain --rows 1000000
+    python Benchmark.py history --rows 5000000 --users 1000
+    python Benchmark.py ratelimit --attempts 200000
+    python Benchmark.py suite --json hasil.json --baseline bench_baseline.json --threshold 0.2
+"""
+import argparse
+import array
+import asyncio
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import Pipeline
+
+
+# ========== DATA SINTETIS ==========
+def buat_csv_sintetis(path, rows, seed=0):
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8", newline="", buffering=Pipeline.UKURAN_BUFFER) as f:
+        f.write("id,temp\n")
+        for i in range(rows):
+            f.write(f"{i},{rng.uniform(-50, 150):.1f}\n")
+
+
+# ========== SKENARIO ==========
+def bench_workers(rows=1_000_000, max_workers=None):
+    """Ukur konversi file CSV dengan 1..N worker. Mengembalikan list hasil per jumlah worker."""
+    max_workers = max_workers or os.cpu_count() or 1
+    hasil = []
+    with tempfile.TemporaryDirectory() as tmp:
+        masuk = os.path.join(tmp, "in.csv")
+        keluar = os.path.join(tmp, "out.csv")
+        buat_csv_sintetis(masuk, rows)
+
+        for workers in range(1, max_workers + 1):
+            baris, _, detik = Pipeline.konversi_file(masuk, keluar, "C", "F", "temp", workers=workers)
+            hasil.append({
+                "workers": workers,
+                "detik": detik,
+                "baris_per_detik": baris / detik,
+                "speedup": hasil[0]["detik"] / detik if hasil else 1.0,
+            })
+    return hasil
+
+def cetak_workers(hasil, file=None):
+    file = file or sys.stdout
+    print(f"{'Workers':<8} {'Detik':>8} {'Baris/detik':>14} {'Speedup':>8}", file=file)
+    print("-" * 41, file=file)
+    for h in hasil:
+        print(f"{h['workers']:<8} {h['detik']:>8.2f} {h['baris_per_detik']:>14,.0f} "
+              f"{h['speedup']:>7.2f}x", file=file)
+
+
+def bench_startup(repeat=10):
+    """
+    Bandingkan latensi masuk ke konverter setelah login: meluncurkan
+    `python SuhuConverter.py` sebagai proses baru (jalur lama) versus memanggil
+    converter_menu(user) di proses yang sama.
+    """
+    from SuhuConverter import SKALA, converter_menu
+
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "SuhuConverter.py")
+    user = {"user_id": 1, "username": "admin", "role": "admin"}
+    keluar = f"{len(SKALA) + 1}\n"
+
+    subproses = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for _ in range(repeat):
+            mulai = time.perf_counter()
+            subprocess.run([sys.executable, script], input="3\n", cwd=tmp, text=True,
+                           stdout=subprocess.DEVNULL, check=False)
+            subproses.append(time.perf_counter() - mulai)
+
+    in_proses = []
+    stdin_asli = sys.stdin
+    try:
+        for _ in range(repeat):
+            sys.stdin = io.StringIO(keluar)
+            mulai = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                converter_menu(user)
+            in_proses.append(time.perf_counter() - mulai)
+    finally:
+        sys.stdin = stdin_asli
+
+    return {
+        "subprocess_ms": statistics.median(subproses) * 1000,
+        "in_process_ms": statistics.median(in_proses) * 1000,
+    }
+
+def cetak_startup(hasil, file=None):
+    file = file or sys.stdout
+    print(f"{'Jalur':<14} {'Median (ms)':>12}", file=file)
+    print("-" * 27, file=file)
+    print(f"{'os.system':<14} {hasil['subprocess_ms']:>12.2f}", file=file)
+    print(f"{'in-process':<14} {hasil['in_process_ms']:>12.3f}", file=file)
+
+
+# Modul yang tidak boleh ikut terimpor oleh `import SuhuConverter`: auth/DB dan numpy
+MODUL_BERAT = ("Login", "sqlite3", "hashlib", "numpy")
+
+def _importtime(modul):
+    """Jalankan `python -X importtime -c "import <modul>"`; kembalikan (wall detik, {modul: kumulatif µs})."""
+    cwd = os.path.dirname(os.path.abspath(__file__))
+    mulai = time.perf_counter()
+    proses = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {modul}"], cwd=cwd,
+                            capture_output=True, text=True, check=True)
+    wall = time.perf_counter() - mulai
+    kumulatif = {}
+    # Format baris: "import time: <self µs> | <kumulatif µs> | <indentasi><nama modul>"
+    for line in proses.stderr.splitlines():
+        kolom = line.removeprefix("import time:").split("|")
+        if len(kolom) == 3 and kolom[1].strip().isdigit():
+            kumulatif[kolom[2].strip()] = int(kolom[1])
+    return wall, kumulatif
+
+def bench_import(repeat=10, modul="SuhuConverter"):
+    """
+    Waktu impor `modul` di proses baru menurut `-X importtime` (median dari
+    `repeat` kali), modul anak termahal, dan modul berat yang ikut terimpor.
+    """
+    wall, total, terakhir = [], [], {}
+    for _ in range(repeat):
+        detik, terakhir = _importtime(modul)
+        wall.append(detik)
+        total.append(terakhir[modul])
+    return {
+        "modul": modul,
+        "import_ms": statistics.median(total) / 1000,
+        "proses_ms": statistics.median(wall) * 1000,
+        "termahal": sorted(((n, us / 1000) for n, us in terakhir.items() if n != modul),
+                           key=lambda x: -x[1])[:5],
+        "modul_berat": [n for n in MODUL_BERAT if n in terakhir and n != modul],
+    }
+
+def cetak_import(hasil, file=None):
+    file = file or sys.stdout
+    print(f"import {hasil['modul']}: {hasil['import_ms']:.1f} ms (proses baru total "
+          f"{hasil['proses_ms']:.1f} ms)", file=file)
+    for nama, ms in hasil["termahal"]:
+        print(f"  {nama:<40} {ms:>8.1f} ms", file=file)
+    berat = ", ".join(hasil["modul_berat"]) or "-"
+    tanda = "✗" if hasil["modul_berat"] else "✓"
+    print(f"{tanda} modul berat (auth/DB, numpy) yang ikut terimpor: {berat}", file=file)
+
+
+def bench_auth_concurrency(clients=(1, 8, 64), logins=256, workers=None, iterasi=100_000):
+    """Throughput login (login/detik) lewat AuthPool untuk beberapa jumlah klien bersamaan."""
+    from Hashing import PasswordHasher
+    from Login import AuthPool, AuthSystem, LoginDatabase
+
+    workers = workers or os.cpu_count() or 1
+    hasil = []
+    with tempfile.TemporaryDirectory() as tmp:
+        db = LoginDatabase(os.path.join(tmp, "users.db"))
+        auth = AuthSystem(db, PasswordHasher(i=iterasi))
+        auth.register("benchuser", "benchpass")
+
+        for jumlah in clients:
+            with AuthPool(auth, workers=workers) as pool:
+                per_klien = max(1, logins // jumlah)
+
+                def klien():
+                    for _ in range(per_klien):
+                        pool.submit("benchuser", "benchpass").result()
+
+                threads = [threading.Thread(target=klien) for _ in range(jumlah)]
+                mulai = time.perf_counter()
+                for t in threads:
+                    t.start()
+                for t in threads:
+                    t.join()
+                detik = time.perf_counter() - mulai
+            hasil.append({"klien": jumlah, "login": per_klien * jumlah, "detik": detik,
+                          "login_per_detik": per_klien * jumlah / detik})
+        db.close()
+    return hasil
+
+def cetak_auth_concurrency(hasil, file=None):
+    file = file or sys.stdout
+    print(f"{'Klien':<8} {'Login':>8} {'Detik':>8} {'Login/detik':>12}", file=file)
+    print("-" * 39, file=file)
+    for h in hasil:
+        print(f"{h['klien']:<8} {h['login']:>8} {h['detik']:>8.2f} {h['login_per_detik']:>12,.1f}",
+              file=file)
+
+
+def _port_bebas():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+async def _baca_respons(reader):
+    head = await reader.readuntil(b"\r\n\r\n")
+    status = int(head.split(b" ", 2)[1])
+    panjang = int(head.lower().split(b"content-length:", 1)[1].split(b"\r\n", 1)[0])
+    return status, await reader.readexactly(panjang)
+
+async def _load_http(port, connections, depth, duration):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = json.dumps({"username": "admin", "password": "admin123"}).encode()
+    writer.write(b"POST /login HTTP/1.1\r\nHost: bench\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body))
+    status, data = await _baca_respons(reader)
+    writer.close()
+    if status != 200:
+        raise RuntimeError(f"Login benchmark gagal: {status} {data!r}")
+    token = json.loads(data)["token"]
+
+    request = (f"GET /convert?value=36.6&from=C&to=F HTTP/1.1\r\nHost: bench\r\n"
+               f"Authorization: Bearer {token}\r\n\r\n").encode()
+    batch = request * depth
+    selesai = time.perf_counter() + duration
+    jumlah = [0] * connections
+
+    async def koneksi(i):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        try:
+            while time.perf_counter() < selesai:
+                writer.write(batch)  # pipelining: `depth` request sekaligus
+                for _ in range(depth):
+                    status, _ = await _baca_respons(reader)
+                    if status != 200:
+                        raise RuntimeError(f"Status tidak terduga: {status}")
+                jumlah[i] += depth
+        finally:
+            writer.close()
+
+    mulai = time.perf_counter()
+    await asyncio.gather(*(koneksi(i) for i in range(connections)))
+    return sum(jumlah), time.perf_counter() - mulai
+
+def bench_http(connections=8, depth=32, duration=5.0, port=None):
+    """
+    Generator beban lokal untuk server HTTP. Tanpa `port`, server dijalankan
+    sebagai proses terpisah (database sementara) agar tidak berbagi core dengan
+    generator beban.
+    """
+    proses = None
+    tmp = None
+    if port is None:
+        port = _port_bebas()
+        tmp = tempfile.TemporaryDirectory()
+        script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "SuhuConverter.py")
+        proses = subprocess.Popen([sys.executable, script, "serve", "--port", str(port),
+                                   "--db", os.path.join(tmp.name, "users.db")],
+                                  stdout=subprocess.PIPE, text=True)
+        proses.stdout.readline()  # tunggu baris "Server berjalan"
+    try:
+        jumlah, detik = asyncio.run(_load_http(port, connections, depth, duration))
+    finally:
+        if proses is not None:
+            proses.terminate()
+            proses.wait()
+            tmp.cleanup()
+    return {"request": jumlah, "detik": detik, "request_per_detik": jumlah / detik}
+
+def cetak_http(hasil, target=20_000, file=None):
+    file = file or sys.stdout
+    tanda = "✓" if hasil["request_per_detik"] >= target else "✗"
+    print(f"{hasil['request']} request dalam {hasil['detik']:.2f} detik: "
+          f"{hasil['request_per_detik']:,.0f} req/detik {tanda} (target {target:,})", file=file)
+
+
+def _waktu(fungsi, ulang=3):
+    terbaik = float("inf")
+    for _ in range(ulang):
+        mulai = time.perf_counter()
+        fungsi()
+        terbaik = min(terbaik, time.perf_counter() - mulai)
+    return terbaik
+
+def bench_cache(rows=1_000_000, distinct=2_000):
+    """
+    Bandingkan aritmetika biasa dengan memoisasi/lookup table pada data terkuantisasi
+    (resolusi 0.1°, `distinct` nilai berbeda). Mengembalikan list (skenario, tanpa, dengan).
+    """
+    import SuhuConverter
+    from SuhuConverter import KonversiMemo, TabelKonversi, konversi
+
+    rng = random.Random(0)
+    kode = [rng.randrange(distinct) for _ in range(rows)]
+    nilai = [k / 10 for k in kode]
+    hasil = []
+
+    # 1. Skalar tanpa pembulatan: satu FMA vs lookup cache
+    memo = KonversiMemo(maxsize=distinct)
+    hasil.append(("skalar", _waktu(lambda: [konversi(v, "C", "F") for v in nilai]),
+                  _waktu(lambda: [memo(v, "C", "F") for v in nilai])))
+
+    # 2. Skalar dengan pembulatan 2 digit: round() ikut di-cache
+    hasil.append(("skalar+round", _waktu(lambda: [round(konversi(v, "C", "F"), 2) for v in nilai]),
+                  _waktu(lambda: [memo(v, "C", "F", 2) for v in nilai])))
+
+    # 3. CSV dengan --precision: parse float + format string ikut di-cache
+    teks = "temp\n" + "".join(f"{v}\n" for v in nilai)
+    def csv_dengan(cache):
+        return lambda: Pipeline.konversi_csv(io.StringIO(teks), io.StringIO(), "C", "F", "temp", 2, cache)
+    hasil.append(("csv --precision 2", _waktu(csv_dengan(0), 1), _waktu(csv_dengan(distinct), 1)))
+
+    # 4. Batch: FMA vektor vs indexing lookup table (butuh numpy)
+    if SuhuConverter.np is not None:
+        np = SuhuConverter.np
+        kode_np = np.array(kode, dtype=np.int16)
+        nilai_np = kode_np / 10
+        out = np.empty(rows)
+        tabel = TabelKonversi("C", "F", 0, distinct / 10)
+        hasil.append(("batch numpy",
+                      _waktu(lambda: SuhuConverter.convert_array(nilai_np, "C", "F", out=out)),
+                      _waktu(lambda: tabel.convert_array(kode_np, out=out))))
+    return hasil
+
+def cetak_cache(hasil, file=None):
+    file = file or sys.stdout
+    print(f"{'Skenario':<20} {'Tanpa (s)':>10} {'Cache (s)':>10} {'Speedup':>8}", file=file)
+    print("-" * 51, file=file)
+    for nama, tanpa, dengan in hasil:
+        print(f"{nama:<20} {tanpa:>10.3f} {dengan:>10.3f} {tanpa / dengan:>7.2f}x", file=file)
+
+
+def bench_exact(rows=200_000):
+    """Throughput (nilai/detik) mode presisi dibandingkan jalur float."""
+    from decimal import Decimal
+    import SuhuConverter
+    from SuhuConverter import konversi, konversi_decimal, konversi_decimal_batch, konversi_fixed
+
+    rng = random.Random(0)
+    milli = [rng.randrange(-50_000, 150_000) for _ in range(rows)]
+    floats = [m / 1000 for m in milli]
+    decimals = [Decimal(m).scaleb(-3) for m in milli]
+
+    skenario = [
+        ("float", lambda: [konversi(v, "C", "F") for v in floats]),
+        ("decimal skalar", lambda: [konversi_decimal(v, "C", "F", 3) for v in decimals]),
+        ("decimal batch", lambda: konversi_decimal_batch(decimals, "C", "F", 3)),
+        ("fixed-point int", lambda: konversi_fixed(milli, "C", "F")),
+    ]
+    if SuhuConverter.np is not None:
+        milli_np = SuhuConverter.np.array(milli, dtype=SuhuConverter.np.int64)
+        floats_np = milli_np / 1000
+        skenario += [
+            ("float numpy", lambda: SuhuConverter.convert_array(floats_np, "C", "F")),
+            ("fixed-point numpy", lambda: konversi_fixed(milli_np, "C", "F")),
+        ]
+    return [(nama, rows / _waktu(fungsi, 1)) for nama, fungsi in skenario]
+
+def cetak_exact(hasil, file=None):
+    file = file or sys.stdout
+    dasar = hasil[0][1]
+    print(f"{'Jalur':<20} {'Nilai/detik':>14} {'vs float':>9}", file=file)
+    print("-" * 45, file=file)
+    for nama, kecepatan in hasil:
+        print(f"{nama:<20} {kecepatan:>14,.0f} {kecepatan / dasar:>8.2f}x", file=file)
+
+
+def bench_chain(rows=1_000_000, rantai=("K", "C", "F", "RE", "F")):
+    """
+    Rantai konversi antar tahap analisis: convert_array per langkah (satu array
+    baru per langkah) dibandingkan TemperatureArray yang menggabungkan langkah
+    menjadi satu transformasi affine dan menghitungnya sekali saat dibaca.
+    """
+    import SuhuConverter
+    from SuhuConverter import TemperatureArray, convert_array
+
+    rng = random.Random(0)
+    data = array.array("d", (rng.uniform(200, 400) for _ in range(rows)))
+    if SuhuConverter.np is not None:
+        data = SuhuConverter.np.frombuffer(data, dtype=SuhuConverter.np.float64)
+
+    def per_langkah():
+        hasil = data
+        for src, dst in zip(rantai, rantai[1:]):
+            hasil = convert_array(hasil, src, dst)
+        return hasil
+
+    def lazy():
+        t = TemperatureArray(data, rantai[0])
+        for dst in rantai[1:]:
+            t = t.to(dst)
+        return t.nilai()
+
+    return [(nama, rows / _waktu(fungsi)) for nama, fungsi in
+            (("per langkah", per_langkah), ("TemperatureArray", lazy))]
+
+def cetak_chain(hasil, file=None):
+    file = file or sys.stdout
+    dasar = hasil[0][1]
+    print(f"{'Rantai K->C->F->RE->F':<22} {'Nilai/detik':>14} {'Speedup':>8}", file=file)
+    print("-" * 46, file=file)
+    for nama, kecepatan in hasil:
+        print(f"{nama:<22} {kecepatan:>14,.0f} {kecepatan / dasar:>7.2f}x", file=file)
+
+def bench_history(rows=1_000_000, users=1_000, batch=10_000, query=200):
+    """
+    Riwayat konversi pada database file: throughput tulis lewat catat() dan
+    latensi median (ms) query rentang waktu, ringkasan rollup dan ringkasan
+    rentang untuk user acak. Data: `rows` konversi tersebar merata ke `users`
+    user selama 30 hari.
+    """
+    from Login import LoginDatabase
+    from Riwayat import RiwayatKonversi
+
+    rng = random.Random(0)
+    awal, rentang = 1_700_000_000.0, 30 * 86400
+    with tempfile.TemporaryDirectory() as tmp:
+        db = LoginDatabase(os.path.join(tmp, "users.db"))
+        riwayat = RiwayatKonversi(db, batch=batch)
+        data = [(rng.randrange(users), awal + i * rentang / rows, rng.uniform(-50, 150)) for i in range(rows)]
+        mulai = time.perf_counter()
+        for user_id, ts, nilai in data:
+            riwayat.catat(user_id, "C", "F", nilai, nilai * 1.8 + 32, ts)
+        riwayat.flush()
+        tulis = time.perf_counter() - mulai
+        del data
+
+        def median_ms(fungsi):
+            waktu = []
+            for _ in range(query):
+                user_id, ts = rng.randrange(users), awal + rng.uniform(0, rentang - 86400)
+                t = time.perf_counter()
+                fungsi(user_id, ts)
+                waktu.append(time.perf_counter() - t)
+            return statistics.median(waktu) * 1000
+
+        # Checkpoint dulu: tanpa itu data masih di file -wal dan users.db tampak kosong
+        db.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        ukuran = sum(os.path.getsize(os.path.join(tmp, nama)) for nama in os.listdir(tmp)
+                     if nama.startswith("users.db"))
+        hasil = {
+            "rows": rows,
+            "tulis_per_detik": rows / tulis,
+            "ukuran_mb": ukuran / 2 ** 20,
+            "rentang_1_hari_ms": median_ms(lambda u, ts: riwayat.riwayat(u, ts, ts + 86400, 1000)),
+            "ringkasan_rollup_ms": median_ms(lambda u, ts: riwayat.ringkasan(u)),
+            "ringkasan_1_hari_ms": median_ms(lambda u, ts: riwayat.ringkasan(u, ts, ts + 86400)),
+        }
+        db.close()
+    return hasil
+
+def cetak_history(hasil, file=None):
+    file = file or sys.stdout
+    print(f"{hasil['rows']:,} baris riwayat, {hasil['ukuran_mb']:.1f} MB, "
+          f"tulis {hasil['tulis_per_detik']:,.0f} baris/detik", file=file)
+    print(f"{'Query (median)':<24} {'ms':>8}", file=file)
+    print("-" * 33, file=file)
+    for nama in ("rentang_1_hari_ms", "ringkasan_rollup_ms", "ringkasan_1_hari_ms"):
+        print(f"{nama.removesuffix('_ms'):<24} {hasil[nama]:>8.3f}", file=file)
+
+
+def bench_ratelimit(attempts=200_000, salah=200, iterasi=None):
+    """
+    Biaya satu percobaan login yang ditolak limiter (tanpa SQL dan hash)
+    dibandingkan percobaan password salah yang lolos limiter (SQL + PBKDF2).
+    """
+    from Hashing import PasswordHasher
+    from Login import AuthSystem, LoginDatabase, LoginDibatasi, LoginLimiter
+
+    hasher = PasswordHasher() if iterasi is None else PasswordHasher(i=iterasi)
+    with tempfile.TemporaryDirectory() as tmp:
+        db = LoginDatabase(os.path.join(tmp, "users.db"))
+        AuthSystem(db, hasher).register("benchuser", "benchpass")
+
+        lolos = AuthSystem(db, hasher, limiter=LoginLimiter(per_user=(salah + 1, 60)))
+        mulai = time.perf_counter()
+        for _ in range(salah):
+            lolos.login("benchuser", "salah")
+        per_gagal = (time.perf_counter() - mulai) / salah
+
+        dibatasi = AuthSystem(db, hasher, limiter=LoginLimiter(per_user=(1, 3600)))
+        dibatasi.login("benchuser", "salah")
+        mulai = time.perf_counter()
+        for _ in range(attempts):
+            try:
+                dibatasi.login("benchuser", "salah", "10.0.0.1")
+            except LoginDibatasi:
+                pass
+        per_tolak = (time.perf_counter() - mulai) / attempts
+        db.close()
+    return {"gagal_us": per_gagal * 1e6, "ditolak_us": per_tolak * 1e6,
+            "ditolak_per_detik": 1 / per_tolak}
+
+def cetak_ratelimit(hasil, file=None):
+    file = file or sys.stdout
+    print(f"{'Percobaan login':<28} {'µs/percobaan':>14}", file=file)
+    print("-" * 43, file=file)
+    print(f"{'password salah (lolos)':<28} {hasil['gagal_us']:>14,.1f}", file=file)
+    print(f"{'ditolak limiter':<28} {hasil['ditolak_us']:>14,.2f}", file=file)
+    print(f"✓ {hasil['ditolak_per_detik']:,.0f} penolakan/detik, "
+          f"{hasil['gagal_us'] / hasil['ditolak_us']:,.0f}x lebih murah dari percobaan yang lolos", file=file)
+
+
+# ========== SUITE REGRESI ==========
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_baseline.json")
+
+def _ukur(ops, fungsi, ulang=3):
+    gc.collect()
+    detik = _waktu(fungsi, ulang)
+    return {"ops": ops, "detik": detik, "ops_per_detik": ops / detik}
+
+def _suite_konversi(rows, ulang):
+    import SuhuConverter
+    from SuhuConverter import celsius_ke_fahrenheit, convert_array, konversi
+
+    rng = random.Random(0)
+    nilai = [rng.uniform(-50, 150) for _ in range(rows)]
+    batch = array.array("d", nilai)
+    if SuhuConverter.np is not None:
+        batch = SuhuConverter.np.array(nilai)
+    return {
+        "konversi.skalar": _ukur(rows, lambda: [konversi(v, "C", "F") for v in nilai], ulang),
+        "konversi.fungsi": _ukur(rows, lambda: [celsius_ke_fahrenheit(v) for v in nilai], ulang),
+        "konversi.batch": _ukur(rows, lambda: convert_array(batch, "C", "F"), ulang),
+    }
+
+def _suite_auth(label, db_name, ops, iterasi):
+    from Hashing import PasswordHasher
+    from Login import AuthSystem, LoginDatabase
+
+    db = LoginDatabase(db_name)
+    auth = AuthSystem(db, PasswordHasher(i=iterasi))
+    nama = [f"bench{i:05d}" for i in range(ops)]
+    try:
+        # Register hanya bisa diukur sekali (username harus unik)
+        hasil = {f"auth.register.{label}": _ukur(ops, lambda: [auth.register(n, "benchpass") for n in nama], 1)}
+        hasil[f"auth.login.{label}"] = _ukur(ops, lambda: [auth.login(n, "benchpass") for n in nama], 1)
+    finally:
+        db.close()
+    return hasil
+
+def _isi_users(db, jumlah):
+    """Isi tabel users langsung lewat executemany; listing admin tidak bergantung pada hash."""
+    from Hashing import PasswordHasher
+    from Login import SQL_INSERT_USER
+
+    tersimpan = PasswordHasher(i=1_000).hash("benchpass")
+    with db.conn:
+        db.conn.executemany(SQL_INSERT_USER, ((f"user{i:07d}", tersimpan, "admin" if i % 100 == 0 else "user")
+                                              for i in range(jumlah)))
+
+def _suite_admin(db_name, jumlah, page_size, ulang):
+    from Login import AuthSystem, LoginDatabase
+
+    db = LoginDatabase(db_name)
+    auth = AuthSystem(db)
+    try:
+        _isi_users(db, jumlah)
+        total = auth.count_users()
+        admin = auth.count_users(role="admin")
+
+        def semua():
+            for _ in auth.iter_user_pages(page_size):
+                pass
+
+        def per_role():
+            for _ in auth.iter_user_pages(page_size, role="admin"):
+                pass
+        return {
+            f"admin.list.{jumlah}": _ukur(total, semua, ulang),
+            f"admin.list_role.{jumlah}": _ukur(admin, per_role, ulang),
+        }
+    finally:
+        db.close()
+
+def _suite_sesi(konversi_per_sesi, ulang):
+    from SuhuConverter import converter_menu, sumber_input
+
+    user = {"user_id": 1, "username": "admin", "role": "admin"}
+    # Satu konversi = asal, nilai, tujuan, jawaban "lagi?"; jawaban terakhir "n" menutup sesi
+    skrip = ["1", "36.6", "2", "y"] * konversi_per_sesi
+    skrip[-1] = "n"
+
+    def sesi():
+        converter_menu(user, sumber_input(skrip), lambda teks: None)
+    return {"sesi.converter_menu": _ukur(konversi_per_sesi, sesi, ulang)}
+
+def _suite_startup(ulang):
+    # Median waktu `import SuhuConverter` di proses baru (-X importtime), per impor
+    detik = bench_import(max(ulang, 3))["import_ms"] / 1000
+    return {"startup.import": {"ops": 1, "detik": detik, "ops_per_detik": 1 / detik}}
+
+def bench_suite(rows=1_000_000, users=(10_000, 1_000_000), auth_ops=20, iterasi=None,
+                sesi=100_000, page_size=100, ulang=3):
+    """
+    Suite regresi: waktu impor modul, konversi skalar/batch, register/login
+    pada database :memory: dan file, listing admin pada `users` user, dan satu
+    sesi converter_menu ber-skrip. Setiap hasil berupa {"ops", "detik", "ops_per_detik"}
+    (waktu terbaik dari `ulang` kali ulang). Data dibuat dengan seed tetap.
+    """
+    from Hashing import DEFAULT_PARAMETER
+    import SuhuConverter
+
+    iterasi = iterasi or DEFAULT_PARAMETER["pbkdf2_sha256"]["i"]
+    hasil = _suite_startup(ulang)
+    hasil.update(_suite_konversi(rows, ulang))
+    with tempfile.TemporaryDirectory() as tmp:
+        hasil.update(_suite_auth("memory", ":memory:", auth_ops, iterasi))
+        hasil.update(_suite_auth("disk", os.path.join(tmp, "auth.db"), auth_ops, iterasi))
+        for jumlah in users:
+            hasil.update(_suite_admin(os.path.join(tmp, f"admin{jumlah}.db"), jumlah, page_size, ulang))
+    hasil.update(_suite_sesi(sesi, ulang))
+
+    meta = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu": os.cpu_count(),
+        "numpy": getattr(SuhuConverter.np, "__version__", None),
+        "parameter": {"rows": rows, "users": list(users), "auth_ops": auth_ops, "iterasi": iterasi,
+                      "sesi": sesi, "page_size": page_size, "ulang": ulang},
+    }
+    return {"meta": meta, "hasil": hasil}
+
+def bandingkan(hasil, baseline, threshold=0.2):
+    """
+    Bandingkan ops/detik dengan baseline. Mengembalikan list
+    (nama, sekarang, dasar, rasio) untuk skenario yang lebih lambat dari
+    (1 - threshold) x baseline. Skenario yang tidak ada di baseline diabaikan.
+    """
+    regresi = []
+    for nama, h in hasil["hasil"].items():
+        dasar = baseline["hasil"].get(nama)
+        if dasar is None:
+            continue
+        rasio = h["ops_per_detik"] / dasar["ops_per_detik"]
+        if rasio < 1 - threshold:
+            regresi.append((nama, h["ops_per_detik"], dasar["ops_per_detik"], rasio))
+    return regresi
+
+def cetak_suite(hasil, baseline=None, file=None):
+    file = file or sys.stdout
+    dasar = baseline["hasil"] if baseline else {}
+    print(f"{'Skenario':<26} {'Ops':>10} {'Detik':>8} {'Ops/detik':>14} {'vs baseline':>12}", file=file)
+    print("-" * 74, file=file)
+    for nama, h in hasil["hasil"].items():
+        banding = f"{h['ops_per_detik'] / dasar[nama]['ops_per_detik']:.2f}x" if nama in dasar else "-"
+        print(f"{nama:<26} {h['ops']:>10,} {h['detik']:>8.3f} {h['ops_per_detik']:>14,.1f} "
+              f"{banding:>12}", file=file)
+
+
+# ========== CLI ==========
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="Benchmark.py", description="Benchmark konverter suhu")
+    sub = parser.add_subparsers(dest="skenario", required=True)
+
+    p = sub.add_parser("workers", help="Skala konversi file dari 1 sampai N core")
+    p.add_argument("--rows", type=int, default=1_000_000)
+    p.add_argument("--max-workers", type=int, default=None)
+
+    p = sub.add_parser("startup", help="Latensi hand-off login -> konverter (subprocess vs in-process)")
+    p.add_argument("--repeat", type=int, default=10)
+
+    p = sub.add_parser("import", help="Waktu `import SuhuConverter` menurut -X importtime")
+    p.add_argument("--repeat", type=int, default=10)
+    p.add_argument("--module", default="SuhuConverter")
+
+    p = sub.add_parser("auth-concurrency", help="Throughput login pada 1/8/64 klien bersamaan")
+    p.add_argument("--clients", type=int, nargs="+", default=[1, 8, 64])
+    p.add_argument("--logins", type=int, default=256)
+    p.add_argument("--workers", type=int, default=None)
+    p.add_argument("--iterations", type=int, default=100_000, help="Iterasi PBKDF2")
+
+    p = sub.add_parser("http", help="Generator beban untuk server HTTP (target 20k req/detik)")
+    p.add_argument("--connections", type=int, default=8)
+    p.add_argument("--depth", type=int, default=32, help="Request per batch pipelining")
+    p.add_argument("--duration", type=float, default=5.0)
+    p.add_argument("--port", type=int, default=None, help="Server yang sudah berjalan")
+    p.add_argument("--target", type=int, default=20_000)
+
+    p = sub.add_parser("cache", help="Kapan memoisasi/lookup table mengalahkan aritmetika biasa")
+    p.add_argument("--rows", type=int, default=1_000_000)
+    p.add_argument("--distinct", type=int, default=2_000)
+
+    p = sub.add_parser("exact", help="Throughput mode Decimal/fixed-point dibandingkan float")
+    p.add_argument("--rows", type=int, default=200_000)
+
+    p = sub.add_parser("chain", help="Rantai konversi per langkah vs TemperatureArray (lazy)")
+    p.add_argument("--rows", type=int, default=1_000_000)
+
+    p = sub.add_parser("history", help="Tulis dan query riwayat konversi pada database besar")
+    p.add_argument("--rows", type=int, default=1_000_000)
+    p.add_argument("--users", type=int, default=1_000)
+    p.add_argument("--batch", type=int, default=10_000)
+
+    p = sub.add_parser("ratelimit", help="Biaya percobaan login yang ditolak limiter")
+    p.add_argument("--attempts", type=int, default=200_000)
+    p.add_argument("--failed", type=int, default=200, help="Percobaan password salah yang lolos")
+    p.add_argument("--iterations", type=int, default=None, help="Iterasi PBKDF2 (default hasher)")
+
+    p = sub.add_parser("suite", help="Suite regresi dengan hasil JSON dan perbandingan baseline")
+    p.add_argument("--rows", type=int, default=1_000_000)
+    p.add_argument("--users", type=int, nargs="+", default=[10_000, 1_000_000])
+    p.add_argument("--auth-ops", type=int, default=20, help="Register/login per database")
+    p.add_argument("--iterations", type=int, default=None, help="Iterasi PBKDF2 (default hasher)")
+    p.add_argument("--session", type=int, default=100_000, help="Konversi dalam sesi ber-skrip")
+    p.add_argument("--repeat", type=int, default=3)
+    p.add_argument("--json", default=None, help="Tulis hasil JSON ke file ini ('-' untuk stdout)")
+    p.add_argument("--baseline", default=None, help=f"File baseline (mis. {os.path.basename(BASELINE)})")
+    p.add_argument("--threshold", type=float, default=0.2,
+                   help="Regresi jika ops/detik turun lebih dari fraksi ini (default 0.2)")
+    p.add_argument("--update-baseline", action="store_true", help="Simpan hasil sebagai baseline baru")
+
+    args = parser.parse_args(argv)
+    if args.skenario == "workers":
+        cetak_workers(bench_workers(args.rows, args.max_workers))
+    elif args.skenario == "startup":
+        cetak_startup(bench_startup(args.repeat))
+    elif args.skenario == "import":
+        hasil = bench_import(args.repeat, args.module)
+        cetak_import(hasil)
+        return 1 if hasil["modul_berat"] else 0
+    elif args.skenario == "auth-concurrency":
+        cetak_auth_concurrency(bench_auth_concurrency(args.clients, args.logins, args.workers,
+                                                      args.iterations))
+    elif args.skenario == "http":
+        cetak_http(bench_http(args.connections, args.depth, args.duration, args.port), args.target)
+    elif args.skenario == "cache":
+        cetak_cache(bench_cache(args.rows, args.distinct))
+    elif args.skenario == "exact":
+        cetak_exact(bench_exact(args.rows))
+    elif args.skenario == "chain":
+        cetak_chain(bench_chain(args.rows))
+    elif args.skenario == "history":
+        cetak_history(bench_history(args.rows, args.users, args.batch))
+    elif args.skenario == "ratelimit":
+        cetak_ratelimit(bench_ratelimit(args.attempts, args.failed, args.iterations))
+    elif args.skenario == "suite":
+        return jalankan_suite(args)
+    return 0
+
+def jalankan_suite(args):
+    path_baseline = args.baseline or BASELINE
+    baseline = None
+    if not args.update_baseline and os.path.exists(path_baseline):
+        with open(path_baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    elif args.baseline and not args.update_baseline:
+        print(f"⚠️ Baseline tidak ditemukan: {args.baseline}", file=sys.stderr)
+        return 2
+
+    hasil = bench_suite(args.rows, args.users, args.auth_ops, args.iterations, args.session,
+                        ulang=args.repeat)
+    cetak_suite(hasil, baseline, file=sys.stderr if args.json == "-" else None)
+    if args.json == "-":
+        json.dump(hasil, sys.stdout, indent=2)
+        print()
+    elif args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(hasil, f, indent=2)
+    if args.update_baseline:
+        with open(path_baseline, "w", encoding="utf-8") as f:
+            json.dump(hasil, f, indent=2)
+        print(f"✓ Baseline disimpan ke {path_baseline}", file=sys.stderr)
+        return 0
+
+    if baseline is None:
+        return 0
+    regresi = bandingkan(hasil, baseline, args.threshold)
+    for nama, sekarang, dasar, rasio in regresi:
+        print(f"✗ Regresi {nama}: {sekarang:,.1f} ops/detik vs baseline {dasar:,.1f} ({rasio:.2f}x)",
+              file=sys.stderr)
+    return 1 if regresi else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
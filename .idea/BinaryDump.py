@@ -0,0 +1,137 @@
+import mmap
+import os
+import struct
+import sys
+
+import SuhuConverter
+from Metrics import METRICS
+from SuhuConverter import convert_array, koefisien
+
+# Header opsional 8 byte: magic, dtype ("f" = float32, "d" = float64) dan kode skala.
+# Ukuran 8 byte menjaga data float64 tetap ter-align.
+HEADER = struct.Struct("<4sc3s")
+MAGIC = b"SUHU"
+
+DTYPE = {"f4": "f", "float32": "f", "f": "f", "f8": "d", "float64": "d", "d": "d"}
+_NUMPY_DTYPE = {"f": "<f4", "d": "<f8"}
+
+# Ukuran jendela mmap; kelipatan ALLOCATIONGRANULARITY sehingga file yang lebih
+# besar dari RAM dipetakan sepotong demi sepotong.
+UKURAN_JENDELA = 64 * mmap.ALLOCATIONGRANULARITY
+
+
+# ========== HEADER ==========
+def baca_header(path):
+    """Mengembalikan (dtype, skala) jika file memiliki header, atau None untuk dump mentah."""
+    with open(path, "rb") as f:
+        data = f.read(HEADER.size)
+    if len(data) < HEADER.size:
+        return None
+    magic, dtype, skala = HEADER.unpack(data)
+    if magic != MAGIC:
+        return None
+    return dtype.decode(), skala.rstrip(b"\0").decode()
+
+def _pack_header(dtype, skala):
+    return HEADER.pack(MAGIC, dtype.encode(), skala.upper().encode())
+
+def tulis_dump(path, values, dtype="f4", skala=None):
+    """Tulis array float little-endian mentah; dengan `skala` header ikut ditulis."""
+    kode = _kode_dtype(dtype)
+    with open(path, "wb") as f:
+        if skala is not None:
+            f.write(_pack_header(kode, skala))
+        f.write(struct.pack(f"<{len(values)}{kode}", *values))
+
+
+# ========== KONVERSI ==========
+def _kode_dtype(dtype):
+    try:
+        return DTYPE[str(dtype).lower()]
+    except KeyError:
+        raise ValueError(f"dtype tidak didukung: {dtype}") from None
+
+def _tampilan(mv, kode):
+    # numpy membaca little-endian secara eksplisit; fallback memakai urutan byte host
+    if SuhuConverter.np is not None:
+        return SuhuConverter.np.frombuffer(mv, dtype=_NUMPY_DTYPE[kode])
+    if sys.byteorder != "little":
+        raise RuntimeError("Dump little-endian di host big-endian membutuhkan numpy")
+    return mv.cast(kode)
+
+def _jendela(ukuran, awal_data, jendela):
+    """Hasilkan (offset, panjang, lewati) untuk setiap jendela mmap di atas file."""
+    for posisi in range(0, ukuran, jendela):
+        panjang = min(jendela, ukuran - posisi)
+        lewati = max(0, awal_data - posisi)
+        if lewati < panjang:
+            yield posisi, panjang, lewati
+
+def konversi_biner(input_path, dst, src=None, dtype=None, output_path=None, jendela=UKURAN_JENDELA):
+    """
+    Konversi dump float32/float64 lewat mmap tanpa membuat objek Python per nilai.
+
+    Tanpa `output_path` file dikonversi in-place; jika tidak, file output dengan
+    ukuran yang sama dibuat lalu dipetakan. `src`/`dtype` diambil dari header bila ada.
+    Mengembalikan jumlah nilai yang dikonversi.
+    """
+    if jendela % mmap.ALLOCATIONGRANULARITY:
+        raise ValueError("Ukuran jendela harus kelipatan mmap.ALLOCATIONGRANULARITY")
+
+    header = baca_header(input_path)
+    if header is not None:
+        h_dtype, h_skala = header
+        if dtype is not None and _kode_dtype(dtype) != h_dtype:
+            raise ValueError(f"dtype {dtype} tidak cocok dengan header ({h_dtype})")
+        if src is not None and src.upper() != h_skala:
+            raise ValueError(f"Skala asal {src} tidak cocok dengan header ({h_skala})")
+        kode, src = h_dtype, h_skala
+        awal_data = HEADER.size
+    else:
+        if src is None or dtype is None:
+            raise ValueError("Dump tanpa header membutuhkan --from dan --dtype")
+        kode = _kode_dtype(dtype)
+        awal_data = 0
+    koefisien(src, dst)  # validasi skala
+
+    ukuran = os.path.getsize(input_path)
+    itemsize = struct.calcsize(kode)
+    if (ukuran - awal_data) % itemsize:
+        raise ValueError("Ukuran file bukan kelipatan ukuran dtype")
+
+    in_place = output_path is None or os.path.abspath(output_path) == os.path.abspath(input_path)
+    with open(input_path, "r+b" if in_place else "rb") as masuk:
+        if in_place:
+            keluar = masuk
+        else:
+            keluar = open(output_path, "w+b")
+            keluar.truncate(ukuran)
+        try:
+            for posisi, panjang, lewati in _jendela(ukuran, awal_data, jendela):
+                _konversi_jendela(masuk, keluar, in_place, posisi, panjang, lewati, kode, src, dst)
+            if header is not None:
+                keluar.seek(0)
+                keluar.write(_pack_header(kode, dst))
+        finally:
+            if not in_place:
+                keluar.close()
+    return (ukuran - awal_data) // itemsize
+
+def _konversi_jendela(masuk, keluar, in_place, posisi, panjang, lewati, kode, src, dst):
+    akses = mmap.ACCESS_WRITE if in_place else mmap.ACCESS_READ
+    with mmap.mmap(masuk.fileno(), panjang, access=akses, offset=posisi) as mm_in:
+        mm_out = mm_in if in_place else mmap.mmap(keluar.fileno(), panjang, offset=posisi)
+        try:
+            with memoryview(mm_in) as mv_in, memoryview(mm_out) as mv_out:
+                nilai = _tampilan(mv_in[lewati:], kode)
+                hasil = nilai if in_place else _tampilan(mv_out[lewati:], kode)
+                # convert_array diimpor by-name sehingga tidak dibungkus Metrics.aktifkan();
+                # setiap jendela dicatat sebagai satu batch
+                with METRICS.timer("konversi_batch_seconds", jalur="biner"):
+                    convert_array(nilai, src, dst, out=hasil)
+                METRICS.inc("konversi_nilai_total", len(nilai), jalur="biner")
+                # Lepaskan view sebelum mmap ditutup
+                del nilai, hasil
+        finally:
+            if not in_place:
+                mm_out.close()
@@ -0,0 +1,119 @@
+import base64
+import hashlib
+import hmac
+import os
+import re
+import time
+
+# Format hash yang disimpan di kolom `password`:
+#     <algoritma>$<parameter>$<salt base64>$<hash base64>
+# contoh: pbkdf2_sha256$i=100000$...$...  atau  scrypt$n=16384,r=8,p=1$...$...
+# Baris lama berisi hex SHA-256 tanpa salt (64 karakter) dan masih bisa diverifikasi.
+ALGORITMA = ("pbkdf2_sha256", "scrypt")
+_LEGACY_SHA256 = re.compile(r"[0-9a-f]{64}")
+
+DEFAULT_PARAMETER = {
+    "pbkdf2_sha256": {"i": 100_000},
+    "scrypt": {"n": 2 ** 14, "r": 8, "p": 1},
+}
+
+
+class PasswordHasher:
+    """Key-derivation bersalt (PBKDF2 atau scrypt) dengan parameter biaya yang bisa diatur."""
+
+    def __init__(self, algoritma="pbkdf2_sha256", salt_bytes=16, **parameter):
+        if algoritma not in ALGORITMA:
+            raise ValueError(f"Algoritma tidak didukung: {algoritma}")
+        self.algoritma = algoritma
+        self.salt_bytes = salt_bytes
+        self.parameter = {**DEFAULT_PARAMETER[algoritma], **parameter}
+
+    @classmethod
+    def dari_spesifikasi(cls, spesifikasi):
+        """Buat hasher dari string "<algoritma>$<parameter>", misalnya "scrypt$n=16384,r=8,p=1"."""
+        algoritma, _, parameter = spesifikasi.partition("$")
+        return cls(algoritma, **_parse_parameter(parameter))
+
+    @property
+    def spesifikasi(self):
+        return f"{self.algoritma}${_format_parameter(self.parameter)}"
+
+    def _turunkan(self, password, salt, algoritma, parameter):
+        if algoritma == "pbkdf2_sha256":
+            return hashlib.pbkdf2_hmac("sha256", password.encode(), salt, parameter["i"])
+        n, r, p = parameter["n"], parameter["r"], parameter["p"]
+        return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p,
+                              maxmem=256 * r * n * p + (1 << 20))
+
+    def hash(self, password):
+        salt = os.urandom(self.salt_bytes)
+        kunci = self._turunkan(password, salt, self.algoritma, self.parameter)
+        return "$".join([self.spesifikasi, _b64(salt), _b64(kunci)])
+
+    def verify(self, password, tersimpan):
+        if is_legacy(tersimpan):
+            kandidat = hashlib.sha256(password.encode()).hexdigest()
+            return hmac.compare_digest(kandidat, tersimpan)
+        try:
+            algoritma, parameter, salt, kunci = tersimpan.split("$")
+            if algoritma not in ALGORITMA:
+                return False
+            kandidat = self._turunkan(password, _unb64(salt), algoritma, _parse_parameter(parameter))
+        except (ValueError, KeyError):
+            return False
+        return hmac.compare_digest(kandidat, _unb64(kunci))
+
+    def needs_rehash(self, tersimpan):
+        """True untuk hash SHA-256 lama atau hash dengan algoritma/biaya yang berbeda."""
+        return is_legacy(tersimpan) or not tersimpan.startswith(self.spesifikasi + "$")
+
+
+def is_legacy(tersimpan):
+    return _LEGACY_SHA256.fullmatch(tersimpan) is not None
+
+def _b64(data):
+    return base64.b64encode(data).decode()
+
+def _unb64(teks):
+    return base64.b64decode(teks.encode())
+
+def _format_parameter(parameter):
+    return ",".join(f"{k}={v}" for k, v in parameter.items())
+
+def _parse_parameter(teks):
+    if not teks:
+        return {}
+    return {k: int(v) for k, v in (bagian.split("=") for bagian in teks.split(","))}
+
+
+# ========== KALIBRASI ==========
+def ukur_ms(hasher, ulang=3):
+    """Median waktu satu hash (ms) untuk hasher ini di mesin saat ini."""
+    waktu = []
+    for _ in range(ulang):
+        mulai = time.perf_counter()
+        hasher.hash("kalibrasi-password")
+        waktu.append(time.perf_counter() - mulai)
+    return sorted(waktu)[len(waktu) // 2] * 1000
+
+def kalibrasi(target_ms=50, algoritma="pbkdf2_sha256"):
+    """Pilih biaya tertinggi yang waktu hash-nya masih di bawah `target_ms` di mesin ini."""
+    if algoritma == "pbkdf2_sha256":
+        # Biaya PBKDF2 linear terhadap jumlah iterasi: ukur sekali lalu skalakan
+        dasar = 10_000
+        ms = ukur_ms(PasswordHasher(algoritma, i=dasar))
+        iterasi = max(1_000, int(dasar * target_ms / ms) // 1_000 * 1_000)
+        hasher = PasswordHasher(algoritma, i=iterasi)
+        while iterasi > 1_000 and ukur_ms(hasher) > target_ms:
+            iterasi = max(1_000, iterasi * 9 // 10 // 1_000 * 1_000)
+            hasher = PasswordHasher(algoritma, i=iterasi)
+        return hasher
+
+    # scrypt: n harus pangkat dua, naikkan selama masih di bawah target
+    hasher = PasswordHasher(algoritma, n=2 ** 10)
+    while hasher.parameter["n"] < 2 ** 17:  # batas memori 128 MB (r=8)
+        kandidat = PasswordHasher(algoritma, n=hasher.parameter["n"] * 2)
+        if ukur_ms(kandidat) > target_ms:
+            break
+        hasher = kandidat
+    return hasher
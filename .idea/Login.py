@@ -1,15 +1,185 @@
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import csv
+import functools
+import json
 import sqlite3
-import hashlib
+import math
 import os
+import secrets
+import shutil
 import sys
+import tempfile
+import threading
+import time
+import weakref
+
+from Hashing import PasswordHasher
+from Metrics import METRICS, terukur
+
+# ========== SQL ==========
+# Teks SQL dibuat konstan agar prepared statement di-cache ulang oleh sqlite3
+# (cache statement per koneksi, dikunci berdasarkan teks SQL).
+SQL_INSERT_USER = "INSERT INTO users (username, password, role) VALUES (?, ?, ?)"
+SQL_LOGIN = "SELECT id, username, role, password FROM users WHERE username=?"
+SQL_UPDATE_PASSWORD = "UPDATE users SET password=? WHERE id=?"
+SQL_GET_SETTING = "SELECT value FROM settings WHERE key=?"
+SQL_SET_SETTING = "INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)"
+SQL_ALL_USERS = "SELECT id, username, role FROM users"
+SQL_EXPORT_USERS = "SELECT id, username, role FROM users ORDER BY id"
+SQL_SET_LOCKOUT = "INSERT OR REPLACE INTO lockouts (username, sampai) VALUES (?, ?)"
+SQL_ACTIVE_LOCKOUTS = "SELECT username, sampai FROM lockouts WHERE sampai > ?"
+SQL_CLEAR_LOCKOUTS = "DELETE FROM lockouts WHERE sampai <= ?"
+
+# ========== MIGRASI ==========
+# Migrasi skema dijalankan berurutan sekali saja; versi terakhir yang sudah
+# diterapkan disimpan di PRAGMA user_version. File users.db lama (versi 0)
+# otomatis dinaikkan ke versi terbaru saat dibuka.
+MIGRASI = [
+    # 1: tabel settings untuk parameter hashing password
+    "CREATE TABLE IF NOT EXISTS settings (key TEXT PRIMARY KEY, value TEXT NOT NULL)",
+    # 2: index untuk daftar user per role (keyset berdasarkan id). Filter awalan
+    #    username memakai index UNIQUE bawaan pada kolom username.
+    "CREATE INDEX IF NOT EXISTS idx_users_role_id ON users (role, id)",
+    # 3-5: riwayat konversi per user (lihat Riwayat.py). Tabel hanya ditambah (append-only);
+    #      query rentang waktu memakai index (user_id, ts), ringkasan per user memakai
+    #      tabel rollup (n, mean, M2 Welford/Chan, min, max) yang diperbarui setiap batch.
+    "CREATE TABLE IF NOT EXISTS history (user_id INTEGER NOT NULL, ts REAL NOT NULL, "
+    "src TEXT NOT NULL, dst TEXT NOT NULL, nilai REAL NOT NULL, hasil REAL NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS idx_history_user_ts ON history (user_id, ts)",
+    "CREATE TABLE IF NOT EXISTS history_rollup (user_id INTEGER NOT NULL, dst TEXT NOT NULL, "
+    "n INTEGER NOT NULL, mean REAL NOT NULL, m2 REAL NOT NULL, "
+    "minimum REAL NOT NULL, maksimum REAL NOT NULL, PRIMARY KEY (user_id, dst)) WITHOUT ROWID",
+    # 6: lockout login yang bertahan setelah restart (AuthSystem dengan lockout > 0)
+    "CREATE TABLE IF NOT EXISTS lockouts (username TEXT PRIMARY KEY, sampai REAL NOT NULL)",
+]
+
+# ========== KONEKSI ==========
+@functools.lru_cache(maxsize=256)
+def _label_sql(sql):
+    return " ".join(sql.split())
+
+class _KursorTerukur(sqlite3.Cursor):
+    """Cursor yang mencatat latensi setiap statement ke histogram sqlite_statement_seconds."""
+
+    def execute(self, sql, parameter=()):
+        mulai = time.perf_counter()
+        try:
+            return super().execute(sql, parameter)
+        finally:
+            METRICS.observe("sqlite_statement_seconds", time.perf_counter() - mulai,
+                            statement=_label_sql(sql))
+
+    def executemany(self, sql, parameter):
+        mulai = time.perf_counter()
+        try:
+            return super().executemany(sql, parameter)
+        finally:
+            METRICS.observe("sqlite_statement_seconds", time.perf_counter() - mulai,
+                            statement=_label_sql(sql))
+
+class _KoneksiTerukur(sqlite3.Connection):
+    # Connection.execute() bawaan tidak lewat cursor() yang di-override, jadi dialihkan di sini
+    def cursor(self, factory=_KursorTerukur):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameter=()):
+        return self.cursor().execute(sql, parameter)
+
+    def executemany(self, sql, parameter):
+        return self.cursor().executemany(sql, parameter)
+
+
+class ConnectionManager:
+    """
+    Menyimpan satu koneksi SQLite yang hidup lama untuk setiap thread.
+    Database ":memory:" disimpan di file sementara (WAL, tanpa fsync) yang
+    dihapus saat close() atau, jika close() lupa dipanggil, saat objek ini
+    dibersihkan garbage collector. Shared-cache in-memory tidak dipakai karena di mode
+    itu tulis bersamaan langsung gagal dengan SQLITE_LOCKED tanpa menunggu
+    busy timeout.
+    """
+
+    def __init__(self, db_name, cached_statements=256):
+        self.db_name = db_name
+        self.cached_statements = cached_statements
+        self._lokal = threading.local()
+        self._lock = threading.Lock()
+        self._koneksi = []
+        self._sementara = None
+        if db_name == ":memory:":
+            self._sementara = tempfile.mkdtemp(prefix="suhu_mem_")
+            self.db_name = os.path.join(self._sementara, "users.db")
+            self._hapus = weakref.finalize(self, shutil.rmtree, self._sementara, True)
+
+    def connection(self):
+        conn = getattr(self._lokal, "conn", None)
+        if conn is None:
+            conn = self._buka()
+            self._lokal.conn = conn
+        return conn
+
+    def _buka(self):
+        # Koneksi terukur hanya dipakai saat metrik aktif; tanpa metrik tidak ada biaya tambahan
+        factory = _KoneksiTerukur if METRICS.aktif else sqlite3.Connection
+        conn = sqlite3.connect(self.db_name, check_same_thread=False,
+                               cached_statements=self.cached_statements, factory=factory)
+        conn.execute("PRAGMA journal_mode=WAL")
+        # Database sementara hilang saat ditutup, jadi tidak perlu fsync sama sekali
+        conn.execute("PRAGMA synchronous=OFF" if self._sementara else "PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA cache_size=-16000")  # 16 MB
+        conn.execute("PRAGMA temp_store=MEMORY")
+        with self._lock:
+            self._koneksi.append(conn)
+        return conn
+
+    def close(self):
+        with self._lock:
+            koneksi, self._koneksi = self._koneksi, []
+        for conn in koneksi:
+            conn.close()
+        self._lokal = threading.local()
+        if self._sementara:
+            self._hapus()
+
 
 # ========== DATABASE ==========
 class LoginDatabase:
+    """
+    Database user. File dibuka dan skema disiapkan saat koneksi pertama kali
+    dipakai, bukan saat objek dibuat; database yang versi skemanya sudah
+    terbaru (PRAGMA user_version) tidak menjalankan DDL atau cek admin lagi.
+    """
+
     def __init__(self, db_name="users.db"):
-        self.conn = sqlite3.connect(db_name)
-        self.setup_database()
+        self.pool = ConnectionManager(db_name)
+        self._siap = False
+        self._menyiapkan = False
+        self._lock_setup = threading.RLock()
+
+    @property
+    def conn(self):
+        # Koneksi milik thread pemanggil; dibuka sekali lalu dipakai ulang
+        if not self._siap:
+            self._siapkan()
+        return self.pool.connection()
+
+    def _siapkan(self):
+        # RLock: setup_database memakai self.conn lagi dari thread yang sama
+        with self._lock_setup:
+            if self._siap or self._menyiapkan:
+                return
+            self._menyiapkan = True
+            try:
+                self.setup_database()
+            finally:
+                self._menyiapkan = False
+            self._siap = True
 
     def setup_database(self):
+        if self.pool.connection().execute("PRAGMA user_version").fetchone()[0] >= len(MIGRASI):
+            return  # skema terverifikasi: tabel, migrasi dan admin sudah dibuat sebelumnya
         cursor = self.conn.cursor()
         cursor.execute('''
                        CREATE TABLE IF NOT EXISTS users (
@@ -20,74 +190,538 @@ class LoginDatabase:
                        )
                        ''')
         self.conn.commit()
+        self.migrate()
 
         # Buat admin jika belum ada
         cursor.execute("SELECT id FROM users WHERE username='admin'")
         if not cursor.fetchone():
-            admin_password = hashlib.sha256("admin123".encode()).hexdigest()
+            admin_password = self.password_hasher().hash("admin123")
             cursor.execute("INSERT INTO users (username, password, role) VALUES ('admin', ?, 'admin')",
                            (admin_password,))
             self.conn.commit()
 
+    def migrate(self):
+        versi = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        for nomor, sql in enumerate(MIGRASI[versi:], versi + 1):
+            with self.conn:
+                self.conn.execute(sql)
+                self.conn.execute(f"PRAGMA user_version = {nomor}")
+
+    def get_setting(self, key, default=None):
+        row = self.conn.execute(SQL_GET_SETTING, (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_setting(self, key, value):
+        with self.conn:
+            self.conn.execute(SQL_SET_SETTING, (key, value))
+
+    def password_hasher(self):
+        # Parameter hasil kalibrasi (jika ada) disimpan di tabel settings
+        spesifikasi = self.get_setting("password_hasher")
+        return PasswordHasher.dari_spesifikasi(spesifikasi) if spesifikasi else PasswordHasher()
+
     def close(self):
-        self.conn.close()
+        self.pool.close()
+
+
+# ========== SESI ==========
+class SessionCache:
+    """
+    Cache token sesi -> user di memori (LRU dengan TTL). Ukurannya dibatasi
+    `max_sesi`; sesi tertua yang tidak dipakai dibuang saat cache penuh dan
+    sesi yang kedaluwarsa dibuang saat diakses.
+    """
+
+    def __init__(self, max_sesi=10_000, ttl=3600, clock=time.monotonic):
+        self.max_sesi = max_sesi
+        self.ttl = ttl
+        self.clock = clock
+        self._data = OrderedDict()  # token -> (user, waktu kedaluwarsa)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def buat(self, user):
+        token = secrets.token_urlsafe(32)
+        with self._lock:
+            self._data[token] = (user, self.clock() + self.ttl)
+            while len(self._data) > self.max_sesi:
+                self._data.popitem(last=False)
+                self.evictions += 1
+        return token
+
+    def get(self, token):
+        with self._lock:
+            entri = self._data.get(token)
+            if entri is None:
+                self.misses += 1
+                return None
+            user, kedaluwarsa = entri
+            if self.clock() >= kedaluwarsa:
+                del self._data[token]
+                self.evictions += 1
+                self.misses += 1
+                return None
+            self._data.move_to_end(token)
+            self.hits += 1
+            return user
+
+    def hapus(self, token):
+        with self._lock:
+            return self._data.pop(token, None) is not None
+
+    def hapus_user(self, user_id):
+        """Cabut semua sesi milik satu user; mengembalikan jumlah sesi yang dicabut."""
+        with self._lock:
+            token = [t for t, (user, _) in self._data.items() if user["user_id"] == user_id]
+            for t in token:
+                del self._data[t]
+        return len(token)
+
+    def stats(self):
+        with self._lock:
+            return {"sesi": len(self._data), "hits": self.hits, "misses": self.misses,
+                    "evictions": self.evictions}
+
+
+# ========== RATE LIMIT ==========
+class LoginDibatasi(RuntimeError):
+    """Percobaan login ditolak karena melewati batas; `tunggu` = detik sampai boleh mencoba lagi."""
+
+    def __init__(self, tunggu):
+        super().__init__(f"Terlalu banyak percobaan login, coba lagi dalam {math.ceil(tunggu)} detik")
+        self.tunggu = tunggu
+
+
+class LoginLimiter:
+    """
+    Token bucket per username dan per sumber (mis. alamat IP) di memori.
+    `per_user`/`per_sumber` = (percobaan, detik): boleh gagal `percobaan` kali
+    berturut-turut, lalu satu token kembali setiap detik/percobaan detik. Hanya
+    percobaan gagal yang memakai token, sehingga login berhasil berulang (mis.
+    banyak klien dengan akun yang sama) tidak pernah dibatasi.
+    Bucket disimpan dalam OrderedDict urut waktu pakai terakhir; bucket yang
+    sudah penuh kembali (idle) dibuang dari depan, dan jumlah kunci dibatasi
+    `max_kunci` sehingga memori tetap terbatas.
+    """
+
+    def __init__(self, per_user=(5, 60), per_sumber=(20, 60), max_kunci=100_000, clock=time.monotonic):
+        self.aturan = {"u": per_user, "s": per_sumber}
+        self.max_kunci = max_kunci
+        self.clock = clock
+        self._idle = max(detik for _, detik in self.aturan.values())
+        self._data = OrderedDict()  # (jenis, kunci) -> [token, waktu terakhir]
+        self._lock = threading.Lock()
+        self.ditolak = 0
+        self.evictions = 0
+
+    def periksa(self, username, sumber=None):
+        """Mengembalikan 0 jika username (dan sumber) boleh mencoba login, atau detik tunggu."""
+        with self._lock:
+            sekarang = self.clock()
+            self._buang_idle(sekarang)
+            tunggu = self._tunggu(("u", username), sekarang)
+            if sumber is not None:
+                tunggu = max(tunggu, self._tunggu(("s", sumber), sekarang))
+            if tunggu:
+                self.ditolak += 1
+            return tunggu
+
+    def gagal(self, username, sumber=None):
+        """Catat satu percobaan gagal: pakai satu token username (dan sumber)."""
+        with self._lock:
+            sekarang = self.clock()
+            self._buang_idle(sekarang)
+            self._ambil(("u", username), sekarang)
+            if sumber is not None:
+                self._ambil(("s", sumber), sekarang)
+
+    def _isi(self, entri, kunci, sekarang):
+        kapasitas, detik = self.aturan[kunci[0]]
+        laju = kapasitas / detik
+        entri[0] = min(kapasitas, entri[0] + (sekarang - entri[1]) * laju)
+        entri[1] = sekarang
+        self._data.move_to_end(kunci)
+        return laju
+
+    def _tunggu(self, kunci, sekarang):
+        # Kunci yang belum pernah gagal tidak disimpan sama sekali
+        entri = self._data.get(kunci)
+        if entri is None:
+            return 0.0
+        laju = self._isi(entri, kunci, sekarang)
+        return 0.0 if entri[0] >= 1 else (1 - entri[0]) / laju
+
+    def _ambil(self, kunci, sekarang):
+        entri = self._data.get(kunci)
+        if entri is None:
+            entri = self._data[kunci] = [float(self.aturan[kunci[0]][0]), sekarang]
+            while len(self._data) > self.max_kunci:
+                self._data.popitem(last=False)
+                self.evictions += 1
+        else:
+            self._isi(entri, kunci, sekarang)
+        entri[0] = max(0.0, entri[0] - 1)
+
+    def _buang_idle(self, sekarang):
+        # Bucket yang tidak dipakai selama satu periode penuh sudah terisi penuh lagi,
+        # jadi sama dengan kunci yang belum pernah terlihat
+        while self._data:
+            kunci, (_, terakhir) = next(iter(self._data.items()))
+            if sekarang - terakhir < self._idle:
+                break
+            del self._data[kunci]
+            self.evictions += 1
+
+    def reset(self, username):
+        """Kosongkan hitungan username (dipanggil setelah login berhasil)."""
+        with self._lock:
+            self._data.pop(("u", username), None)
+
+    def stats(self):
+        with self._lock:
+            return {"kunci": len(self._data), "ditolak": self.ditolak, "evictions": self.evictions}
 
 
 # ========== AUTHENTICATION ==========
 class AuthSystem:
-    def __init__(self, db):
+    """
+    Registrasi, login dan sesi. Dengan `limiter` (LoginLimiter) setiap
+    percobaan login diperiksa sebelum query SQLite atau hashing, dan percobaan
+    gagal dicatat ke limiter. Tanpa limiter login tidak dibatasi; pemanggil
+    untuk klien tak tepercaya (menu login, server) memberikan limiter sendiri.
+    Dengan `lockout` > 0, username yang melewati batas dikunci selama `lockout`
+    detik dan kunci itu disimpan di tabel lockouts sehingga tetap berlaku
+    setelah restart.
+    """
+
+    def __init__(self, db, hasher=None, sessions=None, limiter=None, lockout=0):
         self.db = db
+        self.hasher = hasher or db.password_hasher()
+        self.sessions = sessions or SessionCache()
+        self.limiter = limiter if limiter is not None or not lockout else LoginLimiter()
+        self.lockout = lockout
+        self._terkunci = {}
+        self._dummy = None
+        if lockout:
+            sekarang = time.time()
+            with db.conn:
+                db.conn.execute(SQL_CLEAR_LOCKOUTS, (sekarang,))
+            self._terkunci = dict(db.conn.execute(SQL_ACTIVE_LOCKOUTS, (sekarang,)).fetchall())
 
     def hash_password(self, password):
-        return hashlib.sha256(password.encode()).hexdigest()
+        return self.hasher.hash(password)
+
+    def _hash_dummy(self):
+        # Username tidak dikenal tetap diverifikasi dengan biaya KDF yang sama,
+        # supaya waktu respons tidak membocorkan username mana yang terdaftar
+        if self._dummy is None or self.hasher.needs_rehash(self._dummy):
+            self._dummy = self.hasher.hash(secrets.token_hex(16))
+        return self._dummy
 
+    @terukur("auth_register_seconds", hasil=lambda ok: "ok" if ok else "konflik")
     def register(self, username, password):
-        cursor = self.db.conn.cursor()
+        conn = self.db.conn
         try:
             hashed_password = self.hash_password(password)
-            cursor.execute("INSERT INTO users (username, password, role) VALUES (?, ?, 'user')",
-                           (username, hashed_password))
-            self.db.conn.commit()
+            with conn:
+                conn.execute(SQL_INSERT_USER, (username, hashed_password, "user"))
             return True
         except sqlite3.IntegrityError:
             return False
 
-    def login(self, username, password):
-        cursor = self.db.conn.cursor()
-        hashed_password = self.hash_password(password)
-        cursor.execute("SELECT id, username, role FROM users WHERE username=? AND password=?",
-                       (username, hashed_password))
-        result = cursor.fetchone()
-        if result:
-            return {"user_id": result[0], "username": result[1], "role": result[2]}
-        return None
+    @terukur("auth_login_seconds", hasil=lambda user: "ok" if user else "gagal")
+    def login(self, username, password, sumber=None):
+        """
+        Login dengan username/password. `sumber` (mis. alamat IP klien) ikut dibatasi.
+        Melempar LoginDibatasi tanpa menyentuh database jika batas terlampaui.
+        """
+        self._periksa_batas(username, sumber)
+        conn = self.db.conn
+        result = conn.execute(SQL_LOGIN, (username,)).fetchone()
+        tersimpan = result[3] if result else self._hash_dummy()
+        if not self.hasher.verify(password, tersimpan) or not result:
+            if self.limiter is not None:
+                self.limiter.gagal(username, sumber)
+            return None
+        if self.limiter is not None:
+            self.limiter.reset(username)
+
+        # Hash SHA-256 lama atau biaya lama diganti diam-diam setelah login berhasil
+        if self.hasher.needs_rehash(result[3]):
+            with conn:
+                conn.execute(SQL_UPDATE_PASSWORD, (self.hash_password(password), result[0]))
+
+        user = {"user_id": result[0], "username": result[1], "role": result[2]}
+        user["token"] = self.sessions.buat(user)
+        return user
+
+    def _periksa_batas(self, username, sumber):
+        if self._terkunci:
+            sampai = self._terkunci.get(username)
+            if sampai is not None:
+                sisa = sampai - time.time()
+                if sisa > 0:
+                    raise LoginDibatasi(sisa)
+                self._terkunci.pop(username, None)
+        if self.limiter is None:
+            return
+        tunggu = self.limiter.periksa(username, sumber)
+        if not tunggu:
+            return
+        if self.lockout and username not in self._terkunci:
+            # Satu-satunya tulis ke database di jalur penolakan, sekali per lockout
+            sekarang = time.time()
+            sampai = sekarang + self.lockout
+            if len(self._terkunci) >= self.limiter.max_kunci:
+                self._terkunci = {u: t for u, t in self._terkunci.items() if t > sekarang}
+            self._terkunci[username] = sampai
+            with self.db.conn:
+                self.db.conn.execute(SQL_SET_LOCKOUT, (username, sampai))
+            tunggu = self.lockout
+        raise LoginDibatasi(tunggu)
+
+    def authenticate(self, token):
+        """Cari user dari token sesi (lookup memori, tanpa hashing atau query SQLite)."""
+        return self.sessions.get(token)
+
+    def logout(self, token):
+        return self.sessions.hapus(token)
+
+    def register_many(self, users, chunk=500, workers=4):
+        """
+        Registrasi massal dari iterable (username, password) atau (username, password, role).
+        Setiap potongan `chunk` baris di-hash paralel lalu disisipkan dengan executemany
+        dalam satu transaksi. Baris yang bentrok (username sudah ada/duplikat, data tidak
+        valid) dilaporkan tanpa membatalkan batch.
+        Mengembalikan {"berhasil": jumlah, "konflik": [(nomor_baris, username, alasan)]}.
+        """
+        hasil = {"berhasil": 0, "konflik": []}
+        with ThreadPoolExecutor(workers, thread_name_prefix="hash") as executor:
+            potongan = []
+            for nomor, baris in enumerate(users, 1):
+                potongan.append((nomor, baris))
+                if len(potongan) >= chunk:
+                    self._register_potongan(potongan, executor, hasil)
+                    potongan = []
+            if potongan:
+                self._register_potongan(potongan, executor, hasil)
+        return hasil
+
+    def _register_potongan(self, potongan, executor, hasil):
+        conn = self.db.conn
+        valid = []
+        konflik = []
+        for nomor, baris in potongan:
+            if len(baris) < 2:
+                konflik.append((nomor, baris[0] if baris else "", "baris tidak valid: kurang dari 2 kolom"))
+                continue
+            username, password = baris[0], baris[1]
+            role = baris[2] if len(baris) > 2 and baris[2] else "user"
+            if not isinstance(username, str) or not isinstance(password, str):
+                # mis. "password": 123456 di JSONL; hash() hanya menerima teks
+                konflik.append((nomor, username, "username/password harus berupa teks"))
+            elif not username or not password:
+                konflik.append((nomor, username, "username/password kosong"))
+            elif role not in ("user", "admin"):
+                konflik.append((nomor, username, f"role tidak valid: {role}"))
+            else:
+                valid.append((nomor, username, password, role))
+
+        with conn:
+            tanda = ",".join("?" * len(valid))
+            ada = {r[0] for r in conn.execute(
+                f"SELECT username FROM users WHERE username IN ({tanda})", [v[1] for v in valid])}
+
+            baru = []
+            for nomor, username, password, role in valid:
+                if username in ada:
+                    konflik.append((nomor, username, "username sudah digunakan"))
+                else:
+                    ada.add(username)  # duplikat di dalam file yang sama
+                    baru.append((username, password, role))
+
+            hashes = executor.map(self.hash_password, [b[1] for b in baru])
+            conn.executemany(SQL_INSERT_USER, [(u, h, r) for (u, _, r), h in zip(baru, hashes)])
+        hasil["berhasil"] += len(baru)
+        hasil["konflik"].extend(sorted(konflik))
+
+    def iter_users(self, batch=1000):
+        """Iterasi semua user (id, username, role) per `batch` baris tanpa fetchall()."""
+        cursor = self.db.conn.execute(SQL_EXPORT_USERS)
+        while True:
+            rows = cursor.fetchmany(batch)
+            if not rows:
+                return
+            yield from rows
 
     def get_all_users(self):
-        cursor = self.db.conn.cursor()
-        cursor.execute("SELECT id, username, role FROM users")
-        return cursor.fetchall()
+        return self.db.conn.execute(SQL_ALL_USERS).fetchall()
+
+    def _filter_users(self, role, prefix):
+        kondisi, params = [], []
+        if role:
+            kondisi.append("role = ?")
+            params.append(role)
+        if prefix:
+            # Rentang [prefix, prefix berikutnya) memakai index username, tanpa LIKE
+            kondisi.append("username >= ?")
+            params.append(prefix)
+            batas = _prefix_berikutnya(prefix)
+            if batas is not None:
+                kondisi.append("username < ?")
+                params.append(batas)
+        return kondisi, params
+
+    def list_users(self, after_id=0, limit=50, role=None, prefix=None):
+        """Satu halaman user (id, username, role) dengan id > after_id (keyset pagination)."""
+        kondisi, params = self._filter_users(role, prefix)
+        where = " AND ".join(["id > ?"] + kondisi)
+        sql = f"SELECT id, username, role FROM users WHERE {where} ORDER BY id LIMIT ?"
+        return self.db.conn.execute(sql, [after_id] + params + [limit]).fetchall()
+
+    def count_users(self, role=None, prefix=None):
+        kondisi, params = self._filter_users(role, prefix)
+        where = f" WHERE {' AND '.join(kondisi)}" if kondisi else ""
+        return self.db.conn.execute(f"SELECT COUNT(*) FROM users{where}", params).fetchone()[0]
+
+    def iter_user_pages(self, page_size=20, role=None, prefix=None):
+        """Generator halaman user; halaman berikutnya baru di-query saat diminta."""
+        after_id = 0
+        while True:
+            page = self.list_users(after_id, page_size, role, prefix)
+            if not page:
+                return
+            yield page
+            if len(page) < page_size:
+                return
+            after_id = page[-1][0]
+
+
+def _prefix_berikutnya(prefix):
+    """
+    String terkecil yang lebih besar dari semua string berawalan `prefix`, atau
+    None jika tidak ada (prefix hanya berisi U+10FFFF); rentangnya lalu terbuka ke atas.
+    """
+    inti = prefix.rstrip("\U0010ffff")
+    if not inti:
+        return None
+    berikut = ord(inti[-1]) + 1
+    if 0xD800 <= berikut <= 0xDFFF:
+        berikut = 0xE000  # surrogate tidak bisa dikodekan ke UTF-8 untuk SQLite
+    return inti[:-1] + chr(berikut)
+
+
+# ========== LOGIN KONKUREN ==========
+class AuthOverloaded(RuntimeError):
+    """Antrian login penuh; pemanggil sebaiknya mencoba lagi nanti."""
+
+
+class AuthPool:
+    """
+    Menjalankan AuthSystem.login di thread pool terbatas. hashlib melepas GIL saat
+    key-derivation, jadi beberapa login bisa berjalan bersamaan; setiap worker
+    memakai koneksi SQLite-nya sendiri lewat ConnectionManager. Antrian FIFO
+    (adil) dibatasi `max_antrian`: submit memblokir atau menolak saat penuh.
+    """
+
+    def __init__(self, auth, workers=4, max_antrian=256):
+        self.auth = auth
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix="auth")
+        self._slot = threading.BoundedSemaphore(workers + max_antrian)
+
+    def submit(self, username, password, block=True, timeout=None, sumber=None):
+        if not self._slot.acquire(blocking=block, timeout=timeout if block else None):
+            raise AuthOverloaded("Terlalu banyak login yang sedang antre")
+        try:
+            # `sumber` hanya diteruskan jika ada, agar objek auth dengan login(username, password) tetap bisa dipakai
+            args = (username, password) if sumber is None else (username, password, sumber)
+            future = self._executor.submit(self.auth.login, *args)
+        except BaseException:
+            self._slot.release()
+            raise
+        future.add_done_callback(lambda _: self._slot.release())
+        return future
+
+    def login_many(self, credentials):
+        """Login untuk banyak (username, password); hasil mengikuti urutan input."""
+        return [f.result() for f in [self.submit(u, p) for u, p in credentials]]
+
+    async def login_async(self, username, password, sumber=None):
+        # Tidak memblokir event loop: antrian penuh langsung menjadi AuthOverloaded
+        return await asyncio.wrap_future(self.submit(username, password, block=False, sumber=sumber))
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ========== IMPORT / EXPORT ==========
+def baca_users(file, fmt="csv"):
+    """Stream (username, password, role) dari CSV (header username,password[,role]) atau JSONL."""
+    if fmt == "jsonl":
+        for line in file:
+            if line.strip():
+                obj = json.loads(line)
+                yield obj.get("username", ""), obj.get("password", ""), obj.get("role", "user")
+        return
+    for row in csv.DictReader(file):
+        yield row.get("username", ""), row.get("password", ""), row.get("role") or "user"
+
+def export_users(auth, file, fmt="csv"):
+    """Tulis semua user (tanpa password) secara streaming; mengembalikan jumlah baris."""
+    jumlah = 0
+    writer = csv.writer(file, lineterminator="\n") if fmt == "csv" else None
+    if writer:
+        writer.writerow(["id", "username", "role"])
+    for user_id, username, role in auth.iter_users():
+        if writer:
+            writer.writerow([user_id, username, role])
+        else:
+            file.write(json.dumps({"id": user_id, "username": username, "role": role}) + "\n")
+        jumlah += 1
+    return jumlah
 
 
 # ========== INTERFACE ==========
-def admin_panel(auth):
+def admin_panel(auth, page_size=20):
     print("\n=== ADMIN PANEL ===")
     print("1. Lihat Semua User")
-    print("2. Kembali")
+    print("2. Cari User (role / awalan username)")
+    print("3. Kembali")
 
-    choice = input("\nPilih menu (1-2): ")
+    choice = input("\nPilih menu (1-3): ")
+
+    if choice in ("1", "2"):
+        role = prefix = None
+        if choice == "2":
+            role = input("Role (kosongkan untuk semua): ").strip() or None
+            prefix = input("Awalan username (kosongkan untuk semua): ").strip() or None
 
-    if choice == "1":
-        users = auth.get_all_users()
         print("\n=== DAFTAR USER ===")
+        print(f"Total: {auth.count_users(role, prefix)} user")
         print(f"{'ID':<5} {'Username':<20} {'Role':<10}")
         print("-" * 35)
-        for user in users:
-            print(f"{user[0]:<5} {user[1]:<20} {user[2]:<10}")
+        for page in auth.iter_user_pages(page_size, role, prefix):
+            for user in page:
+                print(f"{user[0]:<5} {user[1]:<20} {user[2]:<10}")
+            if len(page) == page_size:
+                if input("\n[Enter] halaman berikutnya, q untuk selesai: ").lower() == "q":
+                    break
+
 
+def main(db_name="users.db"):
+    from Riwayat import RiwayatKonversi
 
-def main():
-    db = LoginDatabase()
-    auth = AuthSystem(db)
+    db = LoginDatabase(db_name)
+    auth = AuthSystem(db, limiter=LoginLimiter())
+    riwayat = RiwayatKonversi(db)
 
     user = None
 
@@ -121,20 +755,24 @@ def main():
             username = input("Username: ")
             password = input("Password: ")
 
-            user = auth.login(username, password)
+            try:
+                user = auth.login(username, password)
+            except LoginDibatasi as e:
+                print(f"✗ {e}")
+                continue
             if user:
                 print(f"✓ Login berhasil! Selamat datang {user['username']}!")
-                db.close()
 
-                # Jalankan file SuhuConverter.py
+                # Jalankan konverter di proses yang sama dengan user yang sudah login
+                from SuhuConverter import converter_menu
                 print("\n" + "="*50)
                 print("Menjalankan Konverter Suhu...")
                 print("="*50 + "\n")
 
-                os.system('python SuhuConverter.py')
-                # Setelah selesai konversi suhu, kembali ke menu login
-                db = LoginDatabase()
-                auth = AuthSystem(db)
+                converter_menu(user, auth=auth, riwayat=riwayat)
+                riwayat.flush()
+                auth.logout(user["token"])
+                # Setelah selesai konversi suhu, kembali ke menu login (koneksi tetap dipakai)
                 user = None
             else:
                 print("✗ Username atau password salah!")
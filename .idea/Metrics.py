@@ -0,0 +1,212 @@
+import bisect
+import contextlib
+import functools
+import json
+import sys
+import threading
+import time
+
+# Batas bucket histogram latensi (detik), dari konversi skalar (~µs) sampai login (~100 ms)
+BUCKET = (1e-6, 1e-5, 1e-4, 5e-4, 1e-3, 5e-3, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Fungsi di SuhuConverter yang dibungkus saat metrik konversi diaktifkan.
+# Fungsi skalar (celsius_ke_fahrenheit, ...) memanggil konversi() sehingga ikut terukur.
+FUNGSI_KONVERSI = ("konversi", "konversi_decimal", "konversi_fixed", "konversi_decimal_batch",
+                   "convert_array")
+
+
+# ========== REGISTRI ==========
+class Registry:
+    """
+    Counter dan histogram latensi berlabel. Selama `aktif` False setiap
+    pencatatan langsung kembali, dan koneksi SQLite/fungsi konversi tidak
+    dibungkus sama sekali (lihat aktifkan()).
+    """
+
+    def __init__(self, bucket=BUCKET):
+        self.aktif = False
+        self.bucket = tuple(bucket)
+        self._lock = threading.Lock()
+        self._counter = {}
+        self._histogram = {}
+
+    def inc(self, nama, jumlah=1, **label):
+        if not self.aktif:
+            return
+        kunci = (nama, tuple(sorted(label.items())))
+        with self._lock:
+            self._counter[kunci] = self._counter.get(kunci, 0) + jumlah
+
+    def observe(self, nama, detik, **label):
+        if not self.aktif:
+            return
+        kunci = (nama, tuple(sorted(label.items())))
+        indeks = bisect.bisect_left(self.bucket, detik)
+        with self._lock:
+            h = self._histogram.get(kunci)
+            if h is None:
+                # [jumlah per bucket (+Inf terakhir), count, sum]
+                h = self._histogram[kunci] = [[0] * (len(self.bucket) + 1), 0, 0.0]
+            h[0][indeks] += 1
+            h[1] += 1
+            h[2] += detik
+
+    @contextlib.contextmanager
+    def timer(self, nama, **label):
+        mulai = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(nama, time.perf_counter() - mulai, **label)
+
+    def reset(self):
+        with self._lock:
+            self._counter.clear()
+            self._histogram.clear()
+
+    def snapshot(self):
+        """Salinan semua metrik sebagai dict yang bisa di-JSON-kan (bucket kumulatif)."""
+        with self._lock:
+            counter = dict(self._counter)
+            histogram = {k: (list(v[0]), v[1], v[2]) for k, v in self._histogram.items()}
+
+        hasil = {"counters": {}, "histograms": {}}
+        for (nama, label), nilai in sorted(counter.items()):
+            hasil["counters"].setdefault(nama, []).append({"label": dict(label), "nilai": nilai})
+        for (nama, label), (per_bucket, count, total) in sorted(histogram.items()):
+            kumulatif, jalan = {}, 0
+            for batas, n in zip(self.bucket + (float("inf"),), per_bucket):
+                jalan += n
+                kumulatif[_format_batas(batas)] = jalan
+            hasil["histograms"].setdefault(nama, []).append(
+                {"label": dict(label), "count": count, "sum": total, "buckets": kumulatif})
+        return hasil
+
+    def prometheus(self):
+        """Snapshot dalam format teks eksposisi Prometheus 0.0.4."""
+        data = self.snapshot()
+        baris = []
+        for nama, seri in data["counters"].items():
+            baris.append(f"# TYPE {nama} counter")
+            baris += [f"{nama}{_label(s['label'])} {s['nilai']}" for s in seri]
+        for nama, seri in data["histograms"].items():
+            baris.append(f"# TYPE {nama} histogram")
+            for s in seri:
+                for le, n in s["buckets"].items():
+                    baris.append(f"{nama}_bucket{_label(s['label'], le=le)} {n}")
+                baris.append(f"{nama}_sum{_label(s['label'])} {s['sum']!r}")
+                baris.append(f"{nama}_count{_label(s['label'])} {s['count']}")
+        return "\n".join(baris) + "\n" if baris else ""
+
+    def json(self):
+        return json.dumps(self.snapshot(), indent=2)
+
+
+def _format_batas(batas):
+    return "+Inf" if batas == float("inf") else repr(batas)
+
+def _escape(nilai):
+    return str(nilai).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _label(label, **tambahan):
+    semua = {**label, **tambahan}
+    if not semua:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in semua.items()) + "}"
+
+
+METRICS = Registry()
+
+
+# ========== INSTRUMENTASI ==========
+def terukur(nama, hasil=None, **label):
+    """
+    Decorator: catat latensi fungsi ke histogram `nama`. `hasil(nilai_kembali)`
+    memberi label "hasil" (mis. "ok"/"gagal"); exception dicatat sebagai "error".
+    Saat registri tidak aktif, biayanya satu pengecekan atribut.
+    """
+    def dekorator(fungsi):
+        @functools.wraps(fungsi)
+        def pembungkus(*args, **kwargs):
+            if not METRICS.aktif:
+                return fungsi(*args, **kwargs)
+            mulai = time.perf_counter()
+            try:
+                nilai = fungsi(*args, **kwargs)
+            except BaseException:
+                METRICS.observe(nama, time.perf_counter() - mulai, **label, hasil="error")
+                raise
+            if hasil is None:
+                METRICS.observe(nama, time.perf_counter() - mulai, **label)
+            else:
+                METRICS.observe(nama, time.perf_counter() - mulai, **label, hasil=hasil(nilai))
+            return nilai
+        pembungkus.__wrapped_metrics__ = fungsi
+        return pembungkus
+    return dekorator
+
+def aktifkan(konversi=True):
+    """
+    Aktifkan pencatatan. Koneksi SQLite yang dibuka setelah ini ikut diukur per
+    statement; dengan `konversi` fungsi di FUNGSI_KONVERSI diganti versi terukur.
+    Modul yang sudah mengimpor fungsi tersebut by-name (`from SuhuConverter import
+    konversi`) tetap memakai versi aslinya.
+    """
+    METRICS.aktif = True
+    if konversi:
+        import SuhuConverter
+        for nama in FUNGSI_KONVERSI:
+            fungsi = getattr(SuhuConverter, nama)
+            if not hasattr(fungsi, "__wrapped_metrics__"):
+                setattr(SuhuConverter, nama, terukur("konversi_seconds", fungsi=nama)(fungsi))
+
+def nonaktifkan():
+    """Hentikan pencatatan dan kembalikan fungsi konversi asli. Data yang ada tidak dihapus."""
+    METRICS.aktif = False
+    SuhuConverter = sys.modules.get("SuhuConverter")
+    if SuhuConverter is not None:
+        for nama in FUNGSI_KONVERSI:
+            fungsi = getattr(SuhuConverter, nama)
+            setattr(SuhuConverter, nama, getattr(fungsi, "__wrapped_metrics__", fungsi))
+
+def tulis_snapshot(path, registry=METRICS):
+    """Tulis snapshot ke `path`: JSON untuk *.json, selain itu teks Prometheus ("-" = stdout)."""
+    teks = registry.json() + "\n" if str(path).lower().endswith(".json") else registry.prometheus()
+    if path == "-":
+        sys.stdout.write(teks)
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(teks)
+
+
+# ========== PROFILING ==========
+@contextlib.contextmanager
+def profil_sesi(path=None, memori=False, top=15, file=None):
+    """
+    Profil satu sesi dengan cProfile (dan tracemalloc jika `memori`).
+    Statistik disimpan ke `path` (format pstats) bila diberikan; ringkasan
+    fungsi termahal dan alokasi terbesar dicetak ke `file` (default stderr).
+    """
+    import cProfile
+    import pstats
+    import tracemalloc
+
+    file = file or sys.stderr
+    profiler = cProfile.Profile()
+    if memori:
+        tracemalloc.start()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        if path:
+            profiler.dump_stats(path)
+        pstats.Stats(profiler, stream=file).sort_stats("cumulative").print_stats(top)
+        if memori:
+            snapshot = tracemalloc.take_snapshot()
+            _, puncak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"Puncak memori: {puncak / 1024:.1f} KiB", file=file)
+            for stat in snapshot.statistics("lineno")[:top]:
+                print(stat, file=file)
@@ -0,0 +1,291 @@
+from concurrent.futures import ProcessPoolExecutor
+import csv
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from Metrics import METRICS
+from Statistik import Agregat
+from SuhuConverter import KonversiMemo, koefisien
+
+# Ukuran buffer baca/tulis; file dibaca per potongan sehingga memori tetap
+# konstan berapa pun ukuran file-nya.
+UKURAN_BUFFER = 1 << 20
+
+
+# ========== FORMAT ==========
+def deteksi_format(path):
+    if path and path.lower().endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    return "csv"
+
+def _format_nilai(hasil, presisi):
+    if presisi is None:
+        return repr(hasil)
+    return f"{hasil:.{presisi}f}"
+
+
+# ========== PIPELINE ==========
+def konversi_csv(masuk, keluar, src, dst, kolom, presisi=None, cache=0, agregat=None):
+    """
+    Konversi satu kolom CSV baris demi baris dari `masuk` ke `keluar`.
+    Baris dengan nilai bukan angka ditulis apa adanya dan dihitung sebagai dilewati.
+    Dengan `cache` (ukuran LRU > 0 atau SuhuConverter.KonversiMemo) hasil per nilai
+    input di-memoisasi, berguna untuk data sensor terkuantisasi yang nilainya
+    sering berulang. Jika `agregat`
+    (Statistik.Agregat) diberikan, setiap hasil konversi ikut dihitung statistiknya.
+    Mengembalikan (jumlah_baris, jumlah_dilewati).
+    """
+    a, b = koefisien(src, dst)
+    reader = csv.reader(masuk)
+    writer = csv.writer(keluar, lineterminator="\n")
+
+    header = next(reader, None)
+    if header is None:
+        return 0, 0
+    idx = _indeks_kolom(header, kolom)
+    writer.writerow(header)
+    return _konversi_baris_csv(reader, writer, idx, a, b, presisi, cache, agregat)
+
+def _indeks_kolom(header, kolom):
+    if kolom in header:
+        return header.index(kolom)
+    if kolom.isdigit():
+        return int(kolom)
+    raise ValueError(f"Kolom tidak ditemukan: {kolom}")
+
+def _memo(cache):
+    """`cache` berupa KonversiMemo dipakai apa adanya; ukuran > 0 membuat memo baru."""
+    if isinstance(cache, KonversiMemo):
+        return cache
+    return KonversiMemo(cache) if cache else None
+
+def _pengubah(a, b, presisi, cache, agregat=None):
+    memo = _memo(cache)
+    if agregat is None:
+        def ubah(teks):
+            return _format_nilai(float(teks) * a + b, presisi)
+        return memo.bungkus(ubah) if memo else ubah
+
+    # Dengan agregat nilai float ikut dikembalikan, supaya cache tidak melewatkan statistik
+    def hitung(teks):
+        hasil = float(teks) * a + b
+        return _format_nilai(hasil, presisi), hasil
+    if memo:
+        hitung = memo.bungkus(hitung)
+    return _dengan_agregat(hitung, agregat)
+
+def _dengan_agregat(hitung, agregat):
+    """Bungkus `hitung` yang mengembalikan (keluaran, nilai_float): nilai masuk ke agregat."""
+    tambah = agregat.tambah
+
+    def ubah(masuk):
+        keluaran, hasil = hitung(masuk)
+        tambah(hasil)
+        return keluaran
+    return ubah
+
+def _konversi_baris_csv(reader, writer, idx, a, b, presisi, cache=0, agregat=None):
+    ubah = _pengubah(a, b, presisi, cache, agregat)
+    baris = dilewati = 0
+    for row in reader:
+        baris += 1
+        try:
+            row[idx] = ubah(row[idx])
+        except (ValueError, IndexError):
+            dilewati += 1
+        writer.writerow(row)
+    return baris, dilewati
+
+def konversi_jsonl(masuk, keluar, src, dst, kolom, presisi=None, cache=0, agregat=None):
+    """Seperti konversi_csv, tetapi untuk satu objek JSON per baris."""
+    a, b = koefisien(src, dst)
+
+    def hitung(nilai):
+        hasil = float(nilai) * a + b
+        return hasil if presisi is None else round(hasil, presisi)
+    if agregat is not None:
+        # Statistik dihitung dari nilai sebelum dibulatkan
+        def hitung(nilai):
+            hasil = float(nilai) * a + b
+            return hasil if presisi is None else round(hasil, presisi), hasil
+    memo = _memo(cache)
+    if memo:
+        hitung = memo.bungkus(hitung)
+    if agregat is not None:
+        hitung = _dengan_agregat(hitung, agregat)
+
+    baris = dilewati = 0
+    for line in masuk:
+        if not line.strip():
+            continue
+        baris += 1
+        try:
+            obj = json.loads(line)
+        except json.JSONDecodeError:
+            # Baris rusak ditulis apa adanya, seperti baris CSV yang tidak bisa dikonversi
+            dilewati += 1
+            keluar.write(line.rstrip("\r\n"))
+            keluar.write("\n")
+            continue
+        try:
+            obj[kolom] = hitung(obj[kolom])
+        except (KeyError, TypeError, ValueError):
+            dilewati += 1
+        keluar.write(json.dumps(obj, ensure_ascii=False))
+        keluar.write("\n")
+    return baris, dilewati
+
+def buka_masuk(path):
+    if path in (None, "-"):
+        return sys.stdin
+    return open(path, "r", encoding="utf-8", newline="", buffering=UKURAN_BUFFER)
+
+def buka_keluar(path):
+    if path in (None, "-"):
+        return sys.stdout
+    return open(path, "w", encoding="utf-8", newline="", buffering=UKURAN_BUFFER)
+
+def konversi_file(input_path, output_path, src, dst, kolom, fmt=None, presisi=None, workers=1,
+                  cache=0, agregat=None):
+    """
+    Konversi file (atau stdin/stdout untuk "-"). Dengan `workers` > 1 file input
+    dibagi per rentang byte dan dikonversi paralel (lihat konversi_paralel).
+    `agregat` (Statistik.Agregat) diisi statistik hasil dalam skala tujuan.
+    Mengembalikan (baris, dilewati, detik).
+    """
+    fmt = fmt or deteksi_format(input_path)
+    mulai = time.perf_counter()
+
+    if workers > 1:
+        if input_path in (None, "-"):
+            raise ValueError("--workers membutuhkan file input, bukan stdin")
+        baris, dilewati = konversi_paralel(input_path, output_path, src, dst, kolom,
+                                           fmt, presisi, workers, cache, agregat)
+    else:
+        fungsi = konversi_jsonl if fmt == "jsonl" else konversi_csv
+        masuk = buka_masuk(input_path)
+        keluar = buka_keluar(output_path)
+        try:
+            baris, dilewati = fungsi(masuk, keluar, src, dst, kolom, presisi, cache, agregat)
+            keluar.flush()
+        finally:
+            if masuk is not sys.stdin:
+                masuk.close()
+            if keluar is not sys.stdout:
+                keluar.close()
+
+    detik = time.perf_counter() - mulai
+    METRICS.inc("konversi_nilai_total", baris, jalur="pipeline", format=fmt)
+    METRICS.inc("konversi_dilewati_total", dilewati, jalur="pipeline", format=fmt)
+    METRICS.observe("konversi_batch_seconds", detik, jalur="pipeline", format=fmt)
+    return baris, dilewati, detik
+
+
+# ========== PARALEL ==========
+def bagi_rentang(path, mulai, jumlah):
+    """Bagi file dari offset `mulai` menjadi <= `jumlah` rentang byte yang berakhir di batas baris."""
+    ukuran = os.path.getsize(path)
+    batas = [mulai]
+    with open(path, "rb") as f:
+        for i in range(1, jumlah):
+            f.seek(mulai + (ukuran - mulai) * i // jumlah)
+            f.readline()  # maju ke awal baris berikutnya
+            posisi = f.tell()
+            if posisi >= ukuran:
+                break
+            if posisi > batas[-1]:
+                batas.append(posisi)
+    batas.append(ukuran)
+    return [(m, a) for m, a in zip(batas, batas[1:]) if a > m]
+
+def _baris_rentang(f, akhir):
+    posisi = f.tell()
+    while posisi < akhir:
+        line = f.readline()
+        if not line:
+            break
+        posisi += len(line)
+        yield line.decode("utf-8")
+
+def _konversi_shard(tugas):
+    path, mulai, akhir, fmt, src, dst, kolom, presisi, cache, statistik, lebar_bin, path_keluar = tugas
+    # Setiap shard mengisi agregat sendiri; hasilnya digabung di proses induk.
+    # lebar_bin=None tetap berarti statistik diminta, hanya tanpa histogram.
+    agregat = Agregat(dst, lebar_bin) if statistik else None
+    memo = KonversiMemo(cache) if cache else None
+    with open(path, "rb") as f, \
+            open(path_keluar, "w", encoding="utf-8", newline="", buffering=UKURAN_BUFFER) as keluar:
+        f.seek(mulai)
+        baris = _baris_rentang(f, akhir)
+        if fmt == "jsonl":
+            hasil = konversi_jsonl(baris, keluar, src, dst, kolom, presisi, memo, agregat)
+        else:
+            a, b = koefisien(src, dst)
+            writer = csv.writer(keluar, lineterminator="\n")
+            hasil = _konversi_baris_csv(csv.reader(baris), writer, kolom, a, b, presisi, memo, agregat)
+    return hasil + (agregat, memo.stats() if memo else None)
+
+def konversi_paralel(input_path, output_path, src, dst, kolom, fmt="csv", presisi=None, workers=2,
+                     cache=0, agregat=None):
+    """
+    Konversi file besar dengan ProcessPoolExecutor. Setiap worker menulis shard-nya
+    ke file sementara, lalu shard disambung sesuai urutan ke output; agregat
+    statistik per shard digabung ke `agregat`. Memo tidak bisa dibagi antar proses:
+    setiap worker membuat KonversiMemo sendiri dan statistiknya dijumlahkan ke `cache`.
+    Catatan: field CSV yang berisi newline di dalam tanda kutip tidak didukung.
+    """
+    koefisien(src, dst)  # validasi skala sebelum menjalankan worker
+    header = None
+    mulai = 0
+    if fmt == "csv":
+        with open(input_path, "rb") as f:
+            baris_header = f.readline()
+        header = next(csv.reader([baris_header.decode("utf-8")]), None)
+        if header is not None:
+            kolom = _indeks_kolom(header, kolom)
+            mulai = len(baris_header)
+
+    memo = _memo(cache)
+    with tempfile.TemporaryDirectory() as tmp:
+        statistik = agregat is not None
+        lebar_bin = agregat.lebar_bin if statistik else None
+        tugas = [(input_path, m, a, fmt, src, dst, kolom, presisi, memo.maxsize if memo else 0,
+                  statistik, lebar_bin,
+                  os.path.join(tmp, f"{i}.part"))
+                 for i, (m, a) in enumerate(bagi_rentang(input_path, mulai, workers))]
+        with ProcessPoolExecutor(workers) as pool:
+            hasil = list(pool.map(_konversi_shard, tugas))
+
+        keluar = buka_keluar(output_path)
+        try:
+            if header is not None:
+                csv.writer(keluar, lineterminator="\n").writerow(header)
+            for t in tugas:
+                with open(t[-1], "r", encoding="utf-8", newline="") as part:
+                    shutil.copyfileobj(part, keluar, UKURAN_BUFFER)
+            keluar.flush()
+        finally:
+            if keluar is not sys.stdout:
+                keluar.close()
+
+    if agregat is not None:
+        for h in hasil:
+            agregat.gabung(h[2])
+    if memo is not None:
+        for h in hasil:
+            memo.tambah_stats(h[3])
+    return sum(h[0] for h in hasil), sum(h[1] for h in hasil)
+
+def laporan(baris, dilewati, detik, file=None, memo=None):
+    file = file or sys.stderr
+    kecepatan = baris / detik if detik > 0 else float("inf")
+    print(f"✓ {baris} baris dikonversi ({dilewati} dilewati) dalam {detik:.2f} detik "
+          f"({kecepatan:,.0f} baris/detik)", file=file)
+    if memo is not None:
+        s = memo.stats()
+        print(f"  cache: {s['hits']} hit, {s['misses']} miss ({s['currsize']}/{s['maxsize']} entri)",
+              file=file)
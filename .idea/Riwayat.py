@@ -0,0 +1,160 @@
+import array
+import math
+import threading
+import time
+
+from Statistik import Agregat
+
+# ========== SQL ==========
+SQL_INSERT_HISTORY = "INSERT INTO history (user_id, ts, src, dst, nilai, hasil) VALUES (?, ?, ?, ?, ?, ?)"
+# Penggabungan mean/M2 memakai rumus Chan yang sama dengan Agregat.gabung();
+# SQLite menghitung semua ekspresi SET dari nilai baris lama. Faktor REAL
+# (selisih mean) ditulis lebih dulu agar pembagian tidak menjadi pembagian integer.
+SQL_UPSERT_ROLLUP = (
+    "INSERT INTO history_rollup (user_id, dst, n, mean, m2, minimum, maksimum) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT (user_id, dst) DO UPDATE SET "
+    "n = n + excluded.n, "
+    "mean = mean + (excluded.mean - mean) * excluded.n / (n + excluded.n), "
+    "m2 = m2 + excluded.m2 + (excluded.mean - mean) * (excluded.mean - mean) * n * excluded.n "
+    "/ (n + excluded.n), "
+    "minimum = min(minimum, excluded.minimum), maksimum = max(maksimum, excluded.maksimum)"
+)
+SQL_RANGE_HISTORY = ("SELECT ts, src, dst, nilai, hasil FROM history "
+                     "WHERE user_id = ? AND ts >= ? AND ts < ? ORDER BY ts LIMIT ?")
+# Dua lintasan: mean dulu, lalu jumlah kuadrat selisih terhadap mean
+SQL_RANGE_AGREGAT = (
+    "WITH r AS (SELECT dst, hasil FROM history WHERE user_id = ? AND ts >= ? AND ts < ?), "
+    "m AS (SELECT dst, AVG(hasil) AS mean FROM r GROUP BY dst) "
+    "SELECT r.dst, COUNT(*), m.mean, SUM((r.hasil - m.mean) * (r.hasil - m.mean)), "
+    "MIN(r.hasil), MAX(r.hasil) FROM r JOIN m ON r.dst = m.dst GROUP BY r.dst"
+)
+SQL_ROLLUP = "SELECT dst, n, mean, m2, minimum, maksimum FROM history_rollup WHERE user_id = ?"
+
+
+class RiwayatKonversi:
+    """
+    Riwayat konversi per user_id (hasil AuthSystem.login) di tabel `history`
+    database user. Catatan ditampung per kolom di array (ts, nilai, hasil,
+    user_id) lalu ditulis per `batch` baris dengan satu executemany dalam satu
+    transaksi; tabel hanya ditambah, tidak pernah di-update. Bersama setiap batch
+    tabel history_rollup diperbarui sehingga ringkasan seluruh riwayat seorang
+    user tidak perlu memindai tabel. Query membaca buffer yang belum ditulis
+    dengan flush() terlebih dahulu. Nilai NaN/inf tidak dicatat (kolom history
+    NOT NULL, dan SQLite menyimpan NaN sebagai NULL); jumlahnya ada di `dilewati`.
+    """
+
+    def __init__(self, db, batch=1000, clock=time.time):
+        self.db = db
+        self.batch = batch
+        self.clock = clock
+        self._lock = threading.Lock()
+        self.dilewati = 0
+        self._kosongkan()
+
+    def _kosongkan(self):
+        self._user = array.array("q")
+        self._ts = array.array("d")
+        self._nilai = array.array("d")
+        self._hasil = array.array("d")
+        self._src = []
+        self._dst = []
+
+    def __len__(self):
+        return len(self._ts)
+
+    def catat(self, user_id, src, dst, nilai, hasil, ts=None):
+        if not (math.isfinite(nilai) and math.isfinite(hasil)):
+            self.dilewati += 1
+            return
+        with self._lock:
+            self._user.append(user_id)
+            self._ts.append(self.clock() if ts is None else ts)
+            self._src.append(src)
+            self._dst.append(dst)
+            self._nilai.append(nilai)
+            self._hasil.append(hasil)
+            penuh = len(self._ts) >= self.batch
+        if penuh:
+            self.flush()
+
+    def catat_banyak(self, user_id, src, dst, values, results, ts=None):
+        """Catat satu batch konversi (mis. /convert/batch) dengan timestamp yang sama."""
+        hingga = [(v, r) for v, r in zip(values, results) if math.isfinite(v) and math.isfinite(r)]
+        if len(hingga) != len(values):
+            self.dilewati += len(values) - len(hingga)
+            values, results = [v for v, _ in hingga], [r for _, r in hingga]
+        jumlah = len(values)
+        ts = self.clock() if ts is None else ts
+        with self._lock:
+            self._user.extend([user_id] * jumlah)
+            self._ts.extend([ts] * jumlah)
+            self._src.extend([src] * jumlah)
+            self._dst.extend([dst] * jumlah)
+            self._nilai.extend(values)
+            self._hasil.extend(results)
+            penuh = len(self._ts) >= self.batch
+        if penuh:
+            self.flush()
+
+    def flush(self):
+        """Tulis buffer ke SQLite dalam satu transaksi. Mengembalikan jumlah baris."""
+        with self._lock:
+            if not self._ts:
+                return 0
+            kolom = (self._user, self._ts, self._src, self._dst, self._nilai, self._hasil)
+            self._kosongkan()
+
+        # Statistik per (user, skala) untuk batch ini (Welford), lalu digabung ke rollup di SQL
+        rollup = {}
+        for user_id, dst, hasil in zip(kolom[0], kolom[3], kolom[5]):
+            agregat = rollup.get((user_id, dst))
+            if agregat is None:
+                agregat = rollup[(user_id, dst)] = Agregat(dst, lebar_bin=None)
+            agregat.tambah(hasil)
+
+        conn = self.db.conn
+        try:
+            with conn:
+                conn.executemany(SQL_INSERT_HISTORY, zip(*kolom))
+                conn.executemany(SQL_UPSERT_ROLLUP, ((u, d, a.n, a.mean, a.m2, a.min, a.max)
+                                                     for (u, d), a in rollup.items() if a.n))
+        except BaseException:
+            # Transaksi dibatalkan: kembalikan baris ke depan buffer agar tidak hilang
+            with self._lock:
+                for lama, baru in zip(kolom, (self._user, self._ts, self._src, self._dst,
+                                              self._nilai, self._hasil)):
+                    lama.extend(baru)
+                (self._user, self._ts, self._src, self._dst, self._nilai, self._hasil) = kolom
+            raise
+        return len(kolom[1])
+
+    def close(self):
+        self.flush()
+
+    # ========== QUERY ==========
+    def riwayat(self, user_id, mulai=None, akhir=None, limit=100):
+        """Konversi user dalam rentang [mulai, akhir) (epoch detik), urut waktu: (ts, src, dst, nilai, hasil)."""
+        self.flush()
+        mulai = -math.inf if mulai is None else mulai
+        akhir = math.inf if akhir is None else akhir
+        return self.db.conn.execute(SQL_RANGE_HISTORY, (user_id, mulai, akhir, limit)).fetchall()
+
+    def ringkasan(self, user_id, mulai=None, akhir=None):
+        """
+        Statistik hasil per skala tujuan: {dst: {count, min, max, mean, stddev}}.
+        Tanpa rentang waktu dibaca dari tabel rollup (satu lookup per skala);
+        dengan rentang dihitung lewat index (user_id, ts).
+        """
+        self.flush()
+        if mulai is None and akhir is None:
+            rows = self.db.conn.execute(SQL_ROLLUP, (user_id,)).fetchall()
+        else:
+            mulai = -math.inf if mulai is None else mulai
+            akhir = math.inf if akhir is None else akhir
+            rows = self.db.conn.execute(SQL_RANGE_AGREGAT, (user_id, mulai, akhir)).fetchall()
+
+        hasil = {}
+        for dst, n, mean, m2, minimum, maksimum in rows:
+            hasil[dst] = {"count": n, "min": minimum, "max": maksimum, "mean": mean,
+                          "stddev": math.sqrt(max(0.0, m2) / (n - 1)) if n > 1 else 0.0}
+        return hasil
@@ -0,0 +1,293 @@
+import asyncio
+import json
+import math
+import time
+import traceback
+from urllib.parse import parse_qsl, urlsplit
+
+from Login import AuthOverloaded, AuthPool, LoginDibatasi
+from Metrics import METRICS
+from SuhuConverter import koefisien
+
+REASON = {
+    200: "OK",
+    400: "Bad Request",
+    401: "Unauthorized",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    429: "Too Many Requests",
+    431: "Request Header Fields Too Large",
+    500: "Internal Server Error",
+    501: "Not Implemented",
+    503: "Service Unavailable",
+}
+
+BATAS_HEADER = 16 * 1024
+BATAS_BODY = 16 * 1024 * 1024
+
+
+class HttpError(Exception):
+    def __init__(self, status, pesan):
+        super().__init__(pesan)
+        self.status = status
+
+
+# ========== SERVER ==========
+class ConversionServer:
+    """
+    Server HTTP/JSON berbasis asyncio streams untuk fungsi konversi.
+
+    Endpoint:
+        POST /login          {"username", "password"} -> {"token", "user"}
+        POST /logout         mencabut token sesi
+        GET  /convert        ?value=&from=&to=
+        POST /convert        {"value", "from", "to"}
+        POST /convert/batch  {"values": [...], "from", "to"}
+        GET  /history        ?since=&until=&limit= riwayat konversi user + ringkasan
+        GET  /metrics        snapshot metrik (teks Prometheus), hanya jika metrik aktif
+    Endpoint /convert*, /history dan /logout membutuhkan header "Authorization: Bearer <token>";
+    token divalidasi lewat cache sesi AuthSystem (tanpa query SQLite).
+    Koneksi HTTP/1.1 bersifat keep-alive dan request yang di-pipeline
+    dijawab berurutan pada koneksi yang sama. Dengan `riwayat`
+    (Riwayat.RiwayatKonversi) setiap konversi dicatat per user.
+    """
+
+    def __init__(self, auth, workers=4, riwayat=None):
+        self.auth = auth
+        self.pool = AuthPool(auth, workers=workers)
+        self.riwayat = riwayat
+
+    async def start(self, host="127.0.0.1", port=8080):
+        return await asyncio.start_server(self.handle, host, port, limit=BATAS_HEADER)
+
+    def close(self):
+        self.pool.close()
+        if self.riwayat is not None:
+            self.riwayat.close()
+
+    async def handle(self, reader, writer):
+        peer = writer.get_extra_info("peername")
+        sumber = peer[0] if peer else None
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except asyncio.IncompleteReadError:
+                    break  # klien menutup koneksi
+                except asyncio.LimitOverrunError:
+                    writer.write(_respons(431, {"error": REASON[431]}, False))
+                    break
+
+                keep_alive = True
+                mulai = time.perf_counter()
+                try:
+                    method, target, headers, keep_alive = _parse_head(head)
+                    try:
+                        panjang = _panjang_body(headers)
+                    except HttpError:
+                        keep_alive = False  # batas body tidak diketahui, koneksi tidak bisa dipakai lagi
+                        raise
+                    body = await reader.readexactly(panjang) if panjang else b""
+                    status, payload = 200, await self.proses(method, target, headers, body, sumber)
+                except HttpError as e:
+                    status, payload = e.status, {"error": str(e)}
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    raise
+                except Exception:
+                    # Bug di handler dijawab 500, bukan memutus koneksi tanpa respons
+                    traceback.print_exc()
+                    status, payload = 500, {"error": REASON[500]}
+
+                METRICS.observe("http_request_seconds", time.perf_counter() - mulai, status=status)
+                writer.write(_respons(status, payload, keep_alive))
+                if not keep_alive:
+                    break
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def proses(self, method, target, headers, body, sumber=None):
+        url = urlsplit(target)
+        if url.path == "/login":
+            if method != "POST":
+                raise HttpError(405, REASON[405])
+            return await self.login(_json(body), sumber)
+        if url.path == "/logout":
+            if method != "POST":
+                raise HttpError(405, REASON[405])
+            self.auth.logout(self.autentikasi(headers)["token"])
+            return {"logout": True}
+
+        if url.path == "/metrics" and METRICS.aktif:
+            if method != "GET":
+                raise HttpError(405, REASON[405])
+            return METRICS.prometheus()
+
+        if url.path == "/history" and self.riwayat is not None:
+            if method != "GET":
+                raise HttpError(405, REASON[405])
+            return self.history(self.autentikasi(headers), dict(parse_qsl(url.query)))
+
+        if url.path not in ("/convert", "/convert/batch"):
+            raise HttpError(404, REASON[404])
+        user = self.autentikasi(headers)
+
+        if url.path == "/convert":
+            if method == "GET":
+                data = dict(parse_qsl(url.query))
+            elif method == "POST":
+                data = _json(body)
+            else:
+                raise HttpError(405, REASON[405])
+            a, b = _koefisien(data)
+            try:
+                nilai = float(data["value"])
+            except (KeyError, TypeError, ValueError):
+                raise HttpError(400, "Field 'value' harus berupa angka") from None
+            hasil = nilai * a + b
+            if not (math.isfinite(nilai) and math.isfinite(hasil)):
+                # NaN/inf tidak bisa ditulis sebagai JSON yang valid
+                raise HttpError(400, "Field 'value' harus berupa angka berhingga")
+            if self.riwayat is not None:
+                self.riwayat.catat(user["user_id"], str(data["from"]).upper(), str(data["to"]).upper(),
+                                   nilai, hasil)
+            METRICS.inc("konversi_nilai_total", jalur="http")
+            return {"result": hasil}
+
+        if method != "POST":
+            raise HttpError(405, REASON[405])
+        data = _json(body)
+        a, b = _koefisien(data)
+        try:
+            nilai = [float(v) for v in data["values"]]
+        except (KeyError, TypeError, ValueError):
+            raise HttpError(400, "Field 'values' harus berupa array angka") from None
+        hasil = [v * a + b for v in nilai]
+        if not all(map(math.isfinite, hasil)):
+            raise HttpError(400, "Field 'values' harus berupa array angka berhingga")
+        if self.riwayat is not None:
+            self.riwayat.catat_banyak(user["user_id"], str(data["from"]).upper(),
+                                      str(data["to"]).upper(), nilai, hasil)
+        METRICS.inc("konversi_nilai_total", len(hasil), jalur="http")
+        return {"results": hasil}
+
+    def history(self, user, query):
+        try:
+            mulai = float(query["since"]) if "since" in query else None
+            akhir = float(query["until"]) if "until" in query else None
+            limit = int(query.get("limit", 100))
+        except ValueError:
+            raise HttpError(400, "since/until harus epoch detik dan limit bilangan bulat") from None
+        rows = self.riwayat.riwayat(user["user_id"], mulai, akhir, limit)
+        return {"history": [dict(zip(("ts", "from", "to", "value", "result"), r)) for r in rows],
+                "stats": self.riwayat.ringkasan(user["user_id"], mulai, akhir)}
+
+    async def login(self, data, sumber=None):
+        try:
+            user = await self.pool.login_async(str(data["username"]), str(data["password"]), sumber)
+        except KeyError:
+            raise HttpError(400, "Field 'username' dan 'password' wajib diisi") from None
+        except AuthOverloaded as e:
+            raise HttpError(503, str(e)) from None
+        except LoginDibatasi as e:
+            raise HttpError(429, str(e)) from None
+        if user is None:
+            raise HttpError(401, "Username atau password salah")
+        profil = {k: v for k, v in user.items() if k != "token"}
+        return {"token": user["token"], "user": profil}
+
+    def autentikasi(self, headers):
+        skema, _, token = headers.get("authorization", "").partition(" ")
+        user = self.auth.authenticate(token) if skema.lower() == "bearer" else None
+        if user is None:
+            raise HttpError(401, "Token tidak valid atau tidak ada")
+        return user
+
+
+# ========== HTTP ==========
+def _parse_head(head):
+    try:
+        baris = head.decode("latin-1").split("\r\n")
+        method, target, versi = baris[0].split(" ", 2)
+    except ValueError:
+        raise HttpError(400, "Request line tidak valid") from None
+    headers = {}
+    for line in baris[1:]:
+        if line:
+            nama, _, nilai = line.partition(":")
+            headers[nama.strip().lower()] = nilai.strip()
+    koneksi = headers.get("connection", "").lower()
+    keep_alive = koneksi != "close" if versi == "HTTP/1.1" else koneksi == "keep-alive"
+    return method, target, headers, keep_alive
+
+def _panjang_body(headers):
+    # Body chunked tidak didukung; tanpa ditolak, potongan chunk akan terbaca
+    # sebagai request berikutnya pada koneksi keep-alive (desync)
+    if "transfer-encoding" in headers:
+        raise HttpError(501, "Transfer-Encoding tidak didukung, gunakan Content-Length")
+    teks = headers.get("content-length", "0")
+    if not (teks.isascii() and teks.isdigit()):  # juga menolak nilai negatif
+        raise HttpError(400, "Content-Length tidak valid")
+    panjang = int(teks)
+    if panjang > BATAS_BODY:
+        raise HttpError(413, REASON[413])
+    return panjang
+
+def _json(body):
+    try:
+        data = json.loads(body or b"{}")
+    except ValueError:
+        raise HttpError(400, "Body bukan JSON yang valid") from None
+    if not isinstance(data, dict):
+        raise HttpError(400, "Body harus berupa objek JSON")
+    return data
+
+def _koefisien(data):
+    try:
+        return koefisien(str(data["from"]), str(data["to"]))
+    except KeyError:
+        raise HttpError(400, "Field 'from' dan 'to' wajib diisi") from None
+    except ValueError as e:
+        raise HttpError(400, str(e)) from None
+
+def _respons(status, payload, keep_alive):
+    if isinstance(payload, str):
+        body, jenis = payload.encode(), "text/plain; version=0.0.4"
+    else:
+        body, jenis = json.dumps(payload).encode(), "application/json"
+    head = (f"HTTP/1.1 {status} {REASON[status]}\r\n"
+            f"Content-Type: {jenis}\r\n"
+            f"Content-Length: {len(body)}\r\n")
+    if not keep_alive:
+        head += "Connection: close\r\n"
+    return head.encode() + b"\r\n" + body
+
+
+def jalankan(auth, host="127.0.0.1", port=8080, workers=4, riwayat=None):
+    """Jalankan server sampai dihentikan (Ctrl+C). Memakai uvloop jika terpasang."""
+    try:
+        import uvloop
+    except ImportError:
+        uvloop = None
+
+    async def utama():
+        server = ConversionServer(auth, workers, riwayat)
+        srv = await server.start(host, port)
+        alamat = srv.sockets[0].getsockname()
+        print(f"✓ Server berjalan di http://{alamat[0]}:{alamat[1]}", flush=True)
+        try:
+            async with srv:
+                await srv.serve_forever()
+        finally:
+            server.close()
+
+    try:
+        if uvloop is not None:
+            uvloop.run(utama())
+        else:
+            asyncio.run(utama())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,124 @@
+import math
+
+import SuhuConverter
+
+PERSENTIL = (50, 90, 95, 99)
+
+
+class Agregat:
+    """
+    Statistik online satu kali lewat: count, min, max, mean dan varians
+    (algoritma Welford), plus persentil perkiraan dari histogram bin tetap
+    selebar `lebar_bin` (satuan skala tujuan). Memori tidak bergantung pada
+    jumlah nilai, hanya pada rentang nilai / lebar_bin; galat persentil paling
+    besar satu lebar bin; dengan `lebar_bin=None` histogram tidak dibuat dan
+    persentil tidak tersedia. Agregat dari shard paralel digabung dengan gabung().
+    """
+
+    def __init__(self, skala=None, lebar_bin=0.1):
+        if lebar_bin is not None and lebar_bin <= 0:
+            raise ValueError("lebar_bin harus positif")
+        self.skala = skala
+        self.lebar_bin = lebar_bin
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.bin = {}
+        self.dilewati = 0  # NaN/inf tidak ikut dihitung
+
+    def tambah(self, x):
+        if not math.isfinite(x):
+            self.dilewati += 1
+            return
+        self.n += 1
+        d = x - self.mean
+        self.mean += d / self.n
+        self.m2 += d * (x - self.mean)
+        if x < self.min:
+            self.min = x
+        if x > self.max:
+            self.max = x
+        if self.lebar_bin:
+            k = math.floor(x / self.lebar_bin)
+            self.bin[k] = self.bin.get(k, 0) + 1
+
+    def tambah_banyak(self, values):
+        """Tambahkan satu batch (array numpy/array.array/list) sekaligus."""
+        np = SuhuConverter._numpy()  # dimuat saat batch pertama, bukan saat import
+        if np is None:
+            for x in values:
+                self.tambah(x)
+            return
+        data = np.asarray(values, dtype=np.float64)
+        hingga = np.isfinite(data)
+        self.dilewati += int(data.size - np.count_nonzero(hingga))
+        data = data[hingga]
+        if not data.size:
+            return
+        batch = Agregat(self.skala, self.lebar_bin)
+        batch.n = int(data.size)
+        batch.mean = float(data.mean())
+        batch.m2 = float(((data - batch.mean) ** 2).sum())
+        batch.min, batch.max = float(data.min()), float(data.max())
+        if self.lebar_bin:
+            kunci, jumlah = np.unique(np.floor(data / self.lebar_bin).astype(np.int64), return_counts=True)
+            batch.bin = dict(zip(kunci.tolist(), jumlah.tolist()))
+        self.gabung(batch)
+
+    def gabung(self, lain):
+        """Gabungkan agregat lain (mis. dari shard paralel) ke agregat ini."""
+        if lain.lebar_bin != self.lebar_bin:
+            raise ValueError("Agregat dengan lebar_bin berbeda tidak bisa digabung")
+        if lain.skala and self.skala and lain.skala != self.skala:
+            raise ValueError(f"Skala berbeda: {self.skala} dan {lain.skala}")
+        self.skala = self.skala or lain.skala
+        self.dilewati += lain.dilewati
+        if lain.n:
+            # Rumus gabungan Chan et al. untuk mean dan M2
+            n = self.n + lain.n
+            d = lain.mean - self.mean
+            self.mean += d * lain.n / n
+            self.m2 += lain.m2 + d * d * self.n * lain.n / n
+            self.n = n
+            self.min = min(self.min, lain.min)
+            self.max = max(self.max, lain.max)
+            for k, jumlah in lain.bin.items():
+                self.bin[k] = self.bin.get(k, 0) + jumlah
+        return self
+
+    @property
+    def variance(self):
+        """Varians sampel (n - 1); NaN jika kurang dari dua nilai."""
+        return self.m2 / (self.n - 1) if self.n > 1 else math.nan
+
+    @property
+    def stddev(self):
+        return math.sqrt(self.variance)
+
+    def persentil(self, p):
+        """Persentil perkiraan (0-100), interpolasi linear di dalam bin."""
+        if not self.n or not self.lebar_bin:
+            return math.nan
+        if not 0 <= p <= 100:
+            raise ValueError("Persentil harus di antara 0 dan 100")
+        target = p / 100 * self.n
+        kumulatif = 0
+        for k in sorted(self.bin):
+            jumlah = self.bin[k]
+            if kumulatif + jumlah >= target:
+                nilai = (k + (target - kumulatif) / jumlah) * self.lebar_bin
+                return min(max(nilai, self.min), self.max)
+            kumulatif += jumlah
+        return self.max
+
+    def ringkasan(self, persentil=PERSENTIL):
+        hasil = {"skala": self.skala, "count": self.n, "dilewati": self.dilewati,
+                 "min": self.min if self.n else None, "max": self.max if self.n else None,
+                 "mean": self.mean if self.n else None,
+                 "variance": self.variance if self.n > 1 else None,
+                 "stddev": self.stddev if self.n > 1 else None}
+        for p in persentil:
+            hasil[f"p{p:g}"] = self.persentil(p) if self.n and self.lebar_bin else None
+        return hasil
@@ -1,88 +1,551 @@
-from Login import LoginDatabase, AuthSystem
+from collections import namedtuple
+from decimal import Decimal, ROUND_HALF_EVEN
+from fractions import Fraction
+import array
+import functools
+import math
+import numbers
 import sys
+import time
+
+# ========== NUMPY OPSIONAL ==========
+def _numpy():
+    """
+    numpy dimuat saat jalur array pertama kali dipakai, bukan saat `import
+    SuhuConverter` (impor numpy memakan sebagian besar waktu startup).
+    Mengembalikan None jika numpy tidak terpasang (ada fallback Python murni).
+    """
+    try:
+        return globals()["np"]
+    except KeyError:
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        globals()["np"] = numpy
+        return numpy
+
+def __getattr__(nama):
+    # `SuhuConverter.np` tetap tersedia untuk modul lain (dan bisa di-monkeypatch)
+    if nama == "np":
+        return _numpy()
+    raise AttributeError(f"module {__name__!r} has no attribute {nama!r}")
+
+# ========== REGISTRI SKALA ==========
+# Setiap skala disimpan sebagai transformasi affine ke Kelvin:
+#     K = nilai * skala + offset
+# Menambah skala baru cukup dengan satu baris di tabel ini.
+Skala = namedtuple("Skala", "nama simbol skala offset")
+
+SKALA = {
+    "C": Skala("Celsius", "°C", Fraction(1), Fraction("273.15")),
+    "F": Skala("Fahrenheit", "°F", Fraction(5, 9), Fraction("459.67") * Fraction(5, 9)),
+    "K": Skala("Kelvin", "K", Fraction(1), Fraction(0)),
+    "R": Skala("Rankine", "°R", Fraction(5, 9), Fraction(0)),
+    "RE": Skala("Réaumur", "°Ré", Fraction(5, 4), Fraction("273.15")),
+    "DE": Skala("Delisle", "°De", Fraction(-2, 3), Fraction("373.15")),
+    "N": Skala("Newton", "°N", Fraction(100, 33), Fraction("273.15")),
+    "RO": Skala("Rømer", "°Rø", Fraction(40, 21), Fraction("273.15") - Fraction("7.5") * Fraction(40, 21)),
+}
+
+# Koefisien affine (a, b) untuk setiap pasangan skala: hasil = nilai * a + b.
+# Dihitung sekali secara eksak (Fraction); versi float dipakai jalur cepat,
+# versi Fraction dipakai mode presisi (Decimal/fixed-point), dan versi integer
+# (A, B, D) dengan hasil = (nilai * A + B) / D dipakai konversi() untuk input non-float.
+_KOEFISIEN = {}
+_KOEFISIEN_EKSAK = {}
+_KOEFISIEN_INTEGER = {}
+
+def _bangun_koefisien():
+    _KOEFISIEN.clear()
+    _KOEFISIEN_EKSAK.clear()
+    _KOEFISIEN_INTEGER.clear()
+    for src, s in SKALA.items():
+        for dst, d in SKALA.items():
+            a = s.skala / d.skala
+            b = (s.offset - d.offset) / d.skala
+            _KOEFISIEN[(src, dst)] = (float(a), float(b))
+            _KOEFISIEN_EKSAK[(src, dst)] = (a, b)
+            penyebut = math.lcm(a.denominator, b.denominator)
+            _KOEFISIEN_INTEGER[(src, dst)] = (int(a * penyebut), int(b * penyebut), penyebut)
+
+def daftarkan_skala(kode, nama, simbol, skala, offset):
+    """Tambahkan skala baru (K = nilai * skala + offset) ke registri."""
+    SKALA[kode.upper()] = Skala(nama, simbol, Fraction(skala), Fraction(offset))
+    _bangun_koefisien()
+
+_bangun_koefisien()
+
+def koefisien(src, dst):
+    try:
+        return _KOEFISIEN[(src.upper(), dst.upper())]
+    except KeyError:
+        raise ValueError(f"Skala tidak dikenal: {src} -> {dst}") from None
+
+def konversi(nilai, src, dst):
+    """
+    Konversi satu nilai. float memakai koefisien float (jalur cepat); tipe lain
+    (int, Decimal, Fraction) dihitung sebagai (nilai * A + B) / D dengan integer
+    eksak, sehingga tipe input dipertahankan dan 37 °C menjadi 98.6 °F persis
+    seperti rumus aslinya.
+    """
+    if isinstance(nilai, float):
+        a, b = _KOEFISIEN.get((src, dst)) or koefisien(src, dst)
+        return nilai * a + b
+    A, B, D = _KOEFISIEN_INTEGER.get((src, dst)) or _koefisien_fixed(src, dst, 1)
+    return (nilai * A + B) / D
 
 def celsius_ke_fahrenheit(c):
-    return (c * 9/5) + 32
+    return konversi(c, "C", "F")
 
 def celsius_ke_kelvin(c):
-    return c + 273.15
+    return konversi(c, "C", "K")
 
 def fahrenheit_ke_celsius(f):
-    return (f - 32) * 5/9
+    return konversi(f, "F", "C")
 
 def fahrenheit_ke_kelvin(f):
-    return (f - 32) * 5/9 + 273.15
+    return konversi(f, "F", "K")
 
 def kelvin_ke_celsius(k):
-    return k - 273.15
+    return konversi(k, "K", "C")
 
 def kelvin_ke_fahrenheit(k):
-    return (k - 273.15) * 9/5 + 32
+    return konversi(k, "K", "F")
 
-def converter_menu(user=None):
-    if user is None:
-        print("⚠️ Akses ditolak. Silakan login terlebih dahulu.")
-        return
+# ========== KONVERSI EKSAK ==========
+def koefisien_eksak(src, dst):
+    try:
+        return _KOEFISIEN_EKSAK[(src.upper(), dst.upper())]
+    except KeyError:
+        raise ValueError(f"Skala tidak dikenal: {src} -> {dst}") from None
+
+def konversi_decimal(nilai, src, dst, places=6):
+    """
+    Konversi eksak untuk Decimal (atau int/str): dihitung dengan Fraction lalu
+    dibulatkan sekali ke `places` digit desimal (setengah ke atas, sama seperti
+    konversi_fixed).
+    """
+    a, b = koefisien_eksak(src, dst)
+    hasil = Fraction(Decimal(nilai)) * a + b
+    return Decimal(math.floor(hasil * 10 ** places + Fraction(1, 2))).scaleb(-places)
+
+def _koefisien_fixed(src, dst, skala):
+    # y * skala = (x * A + B) / D dengan A, B, D integer
+    a, b = koefisien_eksak(src, dst)
+    d = a.denominator * b.denominator // math.gcd(a.denominator, b.denominator)
+    return int(a * d), int(b * skala * d), d
+
+def konversi_fixed(values, src, dst, skala=1000):
+    """
+    Konversi batch fixed-point: setiap integer x mewakili x / skala (skala=1000
+    untuk milli-derajat, misalnya millikelvin). Hasil juga integer dengan skala
+    yang sama, dibulatkan ke terdekat (setengah ke atas, ke arah +tak hingga)
+    memakai aritmetika integer saja, tanpa Decimal dan tanpa float.
+    """
+    A, B, D = _koefisien_fixed(src, dst, skala)
+    # Input numpy hanya mungkin jika numpy sudah dimuat; list biasa tidak memicu impor
+    np = _numpy() if "numpy" in sys.modules else None
+    if np is not None and isinstance(values, np.ndarray) and values.dtype.kind in "iu":
+        batas = int(np.abs(values).max()) if values.size else 0
+        if (batas * abs(A) + abs(B)) * 2 + D < 2 ** 63:  # aman dari overflow int64
+            return (2 * (values.astype(np.int64) * A + B) + D) // (2 * D)
+        values = values.tolist()
+    return [(2 * (x * A + B) + D) // (2 * D) for x in values]
+
+def konversi_decimal_batch(values, src, dst, places=6):
+    """
+    Jalur cepat untuk banyak Decimal: setiap nilai diubah sekali ke fixed-point
+    10**places, dikonversi dengan aritmetika integer, lalu dikembalikan ke Decimal.
+    Input dengan digit desimal lebih dari `places` dibulatkan dulu ke `places`
+    (ROUND_HALF_EVEN).
+    """
+    skala = 10 ** places
+    kuantum = Decimal(1).scaleb(-places)
+    fixed = [int(Decimal(v).quantize(kuantum, ROUND_HALF_EVEN).scaleb(places)) for v in values]
+    return [Decimal(k).scaleb(-places) for k in konversi_fixed(fixed, src, dst, skala)]
+
+# ========== KONVERSI ARRAY ==========
+def convert_array(values, src, dst, out=None, dtype=None):
+    """
+    Konversi massal untuk numpy array, array.array atau objek buffer lain.
+
+    Rumus dijalankan sebagai satu perkalian dan satu penjumlahan vektor yang
+    ditulis langsung ke `out` (boleh sama dengan `values` untuk in-place),
+    sehingga tidak ada array sementara. Array float32 tetap dihitung dalam
+    float32; `dtype="float32"` memaksa output float32 untuk input lain.
+    """
+    a, b = koefisien(src, dst)
+    np = _numpy()
+    if np is None:
+        return _convert_array_murni(values, a, b, out, dtype)
+
+    arr = np.asarray(values)
+    if arr.dtype.kind != "f":
+        arr = arr.astype(dtype or np.float64)
+    if out is None:
+        out = np.empty(arr.shape, dtype=dtype or arr.dtype)
+        hasil = out
+    else:
+        hasil = np.asarray(out)
+
+    # Koefisien mengikuti dtype output agar jalur float32 tidak naik ke float64
+    a, b = hasil.dtype.type(a), hasil.dtype.type(b)
+    np.multiply(arr, a, out=hasil)
+    np.add(hasil, b, out=hasil)
+    return out
+
+def _convert_array_murni(values, a, b, out, dtype):
+    sumber = values if isinstance(values, (array.array, list, tuple)) else memoryview(values)
+    if out is None:
+        if dtype is not None:
+            kode = "f" if str(dtype) == "float32" else "d"
+        else:
+            kode = getattr(sumber, "typecode", getattr(sumber, "format", "d"))
+            kode = kode if kode in ("f", "d") else "d"
+        out = array.array(kode, bytes(len(sumber) * array.array(kode).itemsize))
+    target = out if isinstance(out, (array.array, list)) else memoryview(out)
+    for i, nilai in enumerate(sumber):
+        target[i] = nilai * a + b
+    return out
+
+# ========== ARRAY SUHU ==========
+class TemperatureArray:
+    """
+    Array suhu dengan skala. Data disimpan sekali dalam buffer ringkas (numpy
+    array atau array.array float) bersama transformasi affine eksak (Fraction)
+    dari nilai buffer ke skala saat ini. to() hanya menggabungkan koefisien,
+    sehingga rantai K -> C -> F -> ... tetap satu perkalian dan satu penjumlahan
+    yang baru dijalankan saat data dibaca atau diekspor.
+
+    Dengan `delta=True` nilai adalah selisih suhu: konversi hanya memakai
+    faktor skala, tanpa offset. Selisih dua array absolut menghasilkan delta,
+    dan absolut + delta menghasilkan absolut.
+    """
+
+    __slots__ = ("_data", "_a", "_b", "skala", "delta")
+    # numpy mendahulukan __radd__/__rmul__ di sini (mis. np.float32(2) * delta)
+    # daripada mengubah array ini menjadi ndarray tanpa skala
+    __array_ufunc__ = None
+
+    def __init__(self, values, skala="K", delta=False, dtype=None):
+        skala = skala.upper()
+        koefisien_eksak(skala, skala)  # validasi kode skala
+        self._data = _buffer_suhu(values, dtype)
+        self._a, self._b = Fraction(1), Fraction(0)
+        self.skala = skala
+        self.delta = delta
+
+    def _turunan(self, data, a, b, skala, delta):
+        baru = object.__new__(TemperatureArray)
+        baru._data, baru._a, baru._b = data, a, b
+        baru.skala, baru.delta = skala, delta
+        return baru
+
+    def to(self, dst):
+        """Array yang sama dalam skala `dst`; buffer dipakai bersama, tidak ada data yang dihitung."""
+        dst = dst.upper()
+        a, b = koefisien_eksak(self.skala, dst)
+        if self.delta:
+            b = 0
+        return self._turunan(self._data, self._a * a, self._b * a + b, dst, self.delta)
+
+    @property
+    def koefisien(self):
+        """(a, b) float yang akan diterapkan ke buffer: nilai = buffer * a + b."""
+        return float(self._a), float(self._b)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __getitem__(self, indeks):
+        if isinstance(indeks, slice):
+            return self._turunan(self._data[indeks], self._a, self._b, self.skala, self.delta)
+        a, b = self.koefisien
+        return float(self._data[indeks]) * a + b
+
+    def __iter__(self):
+        a, b = self.koefisien
+        for nilai in self._data:
+            yield float(nilai) * a + b
+
+    def __repr__(self):
+        jenis = "delta" if self.delta else "absolut"
+        return f"TemperatureArray({len(self)} nilai, {SKALA[self.skala].simbol}, {jenis})"
+
+    # ========== EKSPOR ==========
+    def nilai(self, out=None):
+        """
+        Terapkan transformasi ke seluruh buffer: numpy array (atau array.array tanpa
+        numpy) dengan dtype buffer. Seperti convert_array, hasil bisa ditulis ke `out`.
+        """
+        a, b = self.koefisien
+        np = _numpy()
+        if np is None:
+            return _convert_array_murni(self._data, a, b, out, None)
+        hasil = np.empty_like(self._data) if out is None else np.asarray(out)
+        a, b = hasil.dtype.type(a), hasil.dtype.type(b)
+        np.multiply(self._data, a, out=hasil)
+        np.add(hasil, b, out=hasil)
+        return hasil if out is None else out
+
+    def __array__(self, dtype=None, copy=None):
+        hasil = self.nilai()
+        return hasil if dtype is None else hasil.astype(dtype)
+
+    def tolist(self):
+        return list(self)
+
+    def tobytes(self):
+        return bytes(self.nilai())
+
+    # ========== ARITMETIKA ==========
+    def __add__(self, lain):
+        if isinstance(lain, TemperatureArray):
+            if not (self.delta or lain.delta):
+                raise TypeError("Dua suhu absolut tidak bisa dijumlahkan")
+            return self._gabung(lain, 1, self.delta and lain.delta)
+        # Skalar dianggap selisih dalam skala saat ini: cukup geser offset
+        geser = _pecahan(lain)
+        if geser is NotImplemented:
+            return NotImplemented
+        return self._turunan(self._data, self._a, self._b + geser, self.skala, self.delta)
+
+    __radd__ = __add__
+
+    def __sub__(self, lain):
+        if isinstance(lain, TemperatureArray):
+            if self.delta and not lain.delta:
+                raise TypeError("Suhu absolut tidak bisa dikurangkan dari selisih suhu")
+            return self._gabung(lain, -1, self.delta or not lain.delta)
+        geser = _pecahan(lain)
+        return NotImplemented if geser is NotImplemented else self + -geser
+
+    def __mul__(self, faktor):
+        if not self.delta:
+            raise TypeError("Hanya selisih suhu (delta=True) yang bisa dikalikan")
+        faktor = _pecahan(faktor)
+        if faktor is NotImplemented:
+            return NotImplemented
+        return self._turunan(self._data, self._a * faktor, self._b * faktor, self.skala, True)
+
+    __rmul__ = __mul__
+
+    def _gabung(self, lain, tanda, delta):
+        # Operand kanan diubah ke skala kiri (delta hanya faktor skala), lalu dimaterialisasi
+        if len(lain) != len(self):
+            raise ValueError(f"Panjang array berbeda: {len(self)} dan {len(lain)}")
+        kanan = lain.to(self.skala).nilai()
+        kiri = self.nilai()
+        np = _numpy()
+        if np is not None:
+            hasil = np.add(kiri, kanan) if tanda > 0 else np.subtract(kiri, kanan)
+        else:
+            hasil = array.array(kiri.typecode, (x + tanda * y for x, y in zip(kiri, kanan)))
+        return TemperatureArray(hasil, self.skala, delta)
+
+
+def _pecahan(nilai):
+    # Fraction() tidak menerima skalar float numpy (mis. np.float32), jadi lewat float dulu
+    if isinstance(nilai, (numbers.Rational, Decimal)):
+        return Fraction(nilai)
+    if isinstance(nilai, numbers.Real):
+        return Fraction(float(nilai))
+    return NotImplemented
+
+def _buffer_suhu(values, dtype):
+    kode = "f" if str(dtype) == "float32" else "d"
+    np = _numpy()
+    if np is not None:
+        arr = np.asarray(values)
+        if dtype is None and arr.dtype in (np.float32, np.float64):
+            return arr
+        return arr.astype(np.float32 if kode == "f" else np.float64)
+    if isinstance(values, array.array) and dtype is None and values.typecode in ("f", "d"):
+        return values
+    return array.array(kode, values)
+
+
+# ========== CACHE KONVERSI ==========
+class KonversiMemo:
+    """
+    Memoisasi opsional untuk konversi skalar, dikunci (src, dst, nilai, presisi)
+    dengan batas LRU `maxsize`. Hanya menguntungkan bila hasil juga dibulatkan
+    atau diformat; satu perkalian-penjumlahan saja lebih cepat dari lookup cache.
+    Pipeline memakai bungkus() untuk memoisasi langkah parse+format per baris;
+    stats() menjumlahkan semua fungsi yang dibungkus.
+    """
+
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self._fungsi = []
+        self._luar = {"hits": 0, "misses": 0, "currsize": 0}
+        self._konversi = self.bungkus(self._hitung)
+
+    def bungkus(self, fungsi):
+        """Memoisasi `fungsi` dengan batas LRU yang sama; statistiknya ikut di stats()."""
+        terbungkus = functools.lru_cache(maxsize=self.maxsize)(fungsi)
+        self._fungsi.append(terbungkus)
+        return terbungkus
+
+    @staticmethod
+    def _hitung(src, dst, nilai, presisi):
+        hasil = konversi(nilai, src, dst)
+        return hasil if presisi is None else round(hasil, presisi)
+
+    def __call__(self, nilai, src, dst, presisi=None):
+        return self._konversi(src, dst, nilai, presisi)
 
-    print("\n=== KONVERTER SUHU ===")
-    print(f"User: {user['username']} ({user['role']})")
-    print("1. Celsius")
-    print("2. Fahrenheit")
-    print("3. Kelvin")
-    print("4. Keluar")
+    def stats(self):
+        hasil = dict(self._luar)
+        for fungsi in self._fungsi:
+            info = fungsi.cache_info()
+            hasil["hits"] += info.hits
+            hasil["misses"] += info.misses
+            hasil["currsize"] += info.currsize
+        return {"hits": hasil["hits"], "misses": hasil["misses"],
+                "maxsize": self.maxsize, "currsize": hasil["currsize"]}
 
-    asal = input("\nPilih skala suhu asal (1-4): ")
+    def tambah_stats(self, stats):
+        """Tambahkan stats() memo lain, mis. dari worker konversi paralel."""
+        for kunci in self._luar:
+            self._luar[kunci] += stats[kunci]
 
-    if asal == "4":
-        print("Terima kasih telah menggunakan aplikasi konverter suhu!")
+    def clear(self):
+        for fungsi in self._fungsi:
+            fungsi.cache_clear()
+        self._luar = dict.fromkeys(self._luar, 0)
+
+
+class TabelKonversi:
+    """
+    Lookup table untuk input fixed-point: kode integer k mewakili nilai k / skala
+    (skala=10 untuk resolusi 0.1°). Semua hasil untuk rentang [minimum, maksimum]
+    dihitung sekali, lalu konversi batch cukup dengan indexing langsung.
+    """
+
+    def __init__(self, src, dst, minimum, maksimum, skala=10, dtype="float64"):
+        a, b = koefisien(src, dst)
+        self.skala = skala
+        self.offset = round(minimum * skala)
+        akhir = round(maksimum * skala)
+        kode = "f" if str(dtype) == "float32" else "d"
+        self.tabel = array.array(kode, (k / skala * a + b for k in range(self.offset, akhir + 1)))
+        np = _numpy()
+        self._np_tabel = np.frombuffer(self.tabel, dtype=self.tabel.typecode) if np is not None else None
+
+    def __len__(self):
+        return len(self.tabel)
+
+    def konversi(self, kode):
+        indeks = kode - self.offset
+        if not 0 <= indeks < len(self.tabel):
+            raise ValueError(f"Kode {kode} di luar rentang tabel")
+        return self.tabel[indeks]
+
+    def convert_array(self, kode, out=None):
+        if self._np_tabel is None:
+            if out is None:
+                out = array.array(self.tabel.typecode, bytes(len(kode) * self.tabel.itemsize))
+            for i, k in enumerate(kode):
+                out[i] = self.konversi(k)
+            return out
+
+        np = _numpy()
+        # intp dulu: kode uint8/int8 dikurangi offset bisa overflow atau wrap-around
+        indeks = np.asarray(kode).astype(np.intp) - self.offset
+        if indeks.size and (indeks.min() < 0 or indeks.max() >= len(self.tabel)):
+            raise ValueError("Kode di luar rentang tabel")
+        return np.take(self._np_tabel, indeks, out=out)
+
+
+def sumber_input(file):
+    """Buat pengganti input() yang membaca satu baris per panggilan dari file atau pipe."""
+    baris = iter(file)
+
+    def baca(prompt=""):
+        try:
+            return next(baris).rstrip("\r\n")
+        except StopIteration:
+            raise EOFError from None
+    return baca
+
+def converter_menu(user=None, baca=None, tulis=None, auth=None, riwayat=None):
+    """
+    Sesi konverter interaktif. Berjalan sebagai loop (kedalaman stack konstan),
+    dengan sumber input `baca` dan output `tulis` yang dapat diganti, misalnya
+    sumber_input(file) untuk menjalankan skrip dari file atau pipe.
+
+    Jika `auth` diberikan, `user` (dict hasil login atau token-nya) divalidasi
+    lewat cache sesi AuthSystem. Dengan `riwayat` (Riwayat.RiwayatKonversi)
+    setiap konversi dicatat untuk user_id tersebut.
+    """
+    baca = baca or input
+    tulis = tulis or print
+    if auth is not None and user is not None:
+        user = auth.authenticate(user["token"] if isinstance(user, dict) else user)
+    if user is None:
+        tulis("⚠️ Akses ditolak. Silakan login terlebih dahulu.")
         return
 
+    pilihan = {str(i): kode for i, kode in enumerate(SKALA, 1)}
+    keluar = str(len(pilihan) + 1)
+
+    # Menu sama untuk seluruh sesi, jadi cukup disusun sekali
+    menu = "\n".join(
+        ["\n=== KONVERTER SUHU ===", f"User: {user['username']} ({user['role']})"]
+        + [f"{nomor}. {SKALA[kode].nama}" for nomor, kode in pilihan.items()]
+        + [f"{keluar}. Keluar"]
+    )
+    prompt_asal = f"\nPilih skala suhu asal (1-{keluar}): "
+    prompt_tujuan = f"Pilih skala suhu tujuan (1-{len(pilihan)}): "
+
     try:
-        nilai = float(input("Masukkan nilai suhu: "))
-        tujuan = input("Pilih skala suhu tujuan (1-3): ")
-
-        if asal == "1":
-            if tujuan == "2":
-                hasil = celsius_ke_fahrenheit(nilai)
-                print(f"{nilai}°C = {hasil:.2f}°F")
-            elif tujuan == "3":
-                hasil = celsius_ke_kelvin(nilai)
-                print(f"{nilai}°C = {hasil:.2f}K")
-            else:
-                print(f"{nilai}°C")
-
-        elif asal == "2":
-            if tujuan == "1":
-                hasil = fahrenheit_ke_celsius(nilai)
-                print(f"{nilai}°F = {hasil:.2f}°C")
-            elif tujuan == "3":
-                hasil = fahrenheit_ke_kelvin(nilai)
-                print(f"{nilai}°F = {hasil:.2f}K")
-            else:
-                print(f"{nilai}°F")
-
-        elif asal == "3":
-            if tujuan == "1":
-                hasil = kelvin_ke_celsius(nilai)
-                print(f"{nilai}K = {hasil:.2f}°C")
-            elif tujuan == "2":
-                hasil = kelvin_ke_fahrenheit(nilai)
-                print(f"{nilai}K = {hasil:.2f}°F")
-            else:
-                print(f"{nilai}K")
+        while True:
+            tulis(menu)
+            asal = baca(prompt_asal)
 
-        # Ask if user wants to continue
-        cont = input("\nLakukan konversi lagi? (y/n): ").lower()
-        if cont == "y":
-            converter_menu(user)
+            if asal == keluar:
+                tulis("Terima kasih telah menggunakan aplikasi konverter suhu!")
+                return
 
-    except ValueError:
-        print("⚠️ Input tidak valid. Masukkan angka untuk nilai suhu.")
-        converter_menu(user)
+            try:
+                nilai = float(baca("Masukkan nilai suhu: "))
+            except ValueError:
+                tulis("⚠️ Input tidak valid. Masukkan angka untuk nilai suhu.")
+                continue
+            tujuan = baca(prompt_tujuan)
+
+            src = pilihan.get(asal)
+            dst = pilihan.get(tujuan)
+            if src and dst:
+                if src == dst:
+                    hasil = nilai
+                    tulis(f"{nilai}{SKALA[src].simbol}")
+                else:
+                    hasil = konversi(nilai, src, dst)
+                    tulis(f"{nilai}{SKALA[src].simbol} = {hasil:.2f}{SKALA[dst].simbol}")
+                if riwayat is not None:
+                    riwayat.catat(user["user_id"], src, dst, nilai, hasil)
+            else:
+                tulis("⚠️ Pilihan skala tidak valid.")
+
+            # Ask if user wants to continue
+            if baca("\nLakukan konversi lagi? (y/n): ").lower() != "y":
+                return
+    except EOFError:
+        # Sumber input habis (akhir file/pipe): sesi selesai
+        return
 
 def login_screen():
+    # Modul auth (sqlite3, hashlib) baru diimpor saat dibutuhkan, sehingga
+    # `import SuhuConverter` untuk fungsi konversi saja tetap ringan
+    from Login import AuthSystem, LoginDatabase, LoginDibatasi, LoginLimiter
+    from Riwayat import RiwayatKonversi
+
     db = LoginDatabase()
-    auth = AuthSystem(db)
+    auth = AuthSystem(db, limiter=LoginLimiter())
+    riwayat = RiwayatKonversi(db)
 
     while True:
         print("\n=== SISTEM LOGIN KONVERTER SUHU ===")
@@ -113,10 +576,16 @@ def login_screen():
             username = input("Username: ")
             password = input("Password: ")
 
-            user = auth.login(username, password)
+            try:
+                user = auth.login(username, password)
+            except LoginDibatasi as e:
+                print(f"✗ {e}")
+                continue
             if user:
                 print(f"✓ Login berhasil! Selamat datang {user['username']}!")
-                converter_menu(user)
+                converter_menu(user, auth=auth, riwayat=riwayat)
+                riwayat.flush()
+                auth.logout(user["token"])
             else:
                 print("✗ Username atau password salah!")
 
@@ -127,8 +596,221 @@ def login_screen():
         else:
             print("✗ Pilihan tidak valid!")
 
-def main():
+# ========== CLI (NON-INTERAKTIF) ==========
+def _waktu_arg(teks):
+    from datetime import datetime
+    try:
+        return float(teks)
+    except ValueError:
+        return datetime.fromisoformat(teks).timestamp()
+
+def buat_parser():
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="SuhuConverter.py", description="Konverter suhu")
+    parser.add_argument("--metrics", metavar="FILE",
+                        help="Catat metrik lalu tulis snapshot saat selesai (*.json = JSON, lainnya Prometheus)")
+    parser.add_argument("--profile", metavar="FILE", help="Profil sesi dengan cProfile, simpan statistik pstats")
+    parser.add_argument("--tracemalloc", action="store_true", help="Laporkan alokasi memori terbesar sesi")
+    sub = parser.add_subparsers(dest="perintah", help="Tanpa perintah: sesi login interaktif")
+
+    p = sub.add_parser("convert", help="Konversi kolom suhu pada file CSV/JSONL secara streaming")
+    p.add_argument("--from", dest="src", required=True, type=str.upper, choices=list(SKALA))
+    p.add_argument("--to", dest="dst", required=True, type=str.upper, choices=list(SKALA))
+    p.add_argument("--column", required=True, help="Nama kolom (CSV) atau key (JSONL)")
+    p.add_argument("--format", choices=["csv", "jsonl"], help="Default: dari ekstensi file")
+    p.add_argument("--precision", type=int, help="Jumlah digit desimal hasil")
+    p.add_argument("--workers", type=int, default=1, help="Jumlah proses paralel (butuh file input)")
+    p.add_argument("--cache", type=int, default=0, metavar="N",
+                   help="Memoisasi LRU N nilai berulang (data terkuantisasi)")
+    p.add_argument("--stats", nargs="?", const="-", metavar="FILE",
+                   help="Hitung statistik hasil (count/min/max/mean/varians/persentil) dalam satu lewat; "
+                        "JSON ke FILE atau stderr")
+    p.add_argument("--bin-width", type=float, default=0.1,
+                   help="Lebar bin histogram persentil dalam skala tujuan (default 0.1)")
+    p.add_argument("-o", "--output", default="-", help="File output (default: stdout)")
+    p.add_argument("input", nargs="?", default="-", help="File input (default: stdin)")
+
+    p = sub.add_parser("binary", help="Konversi dump float32/float64 little-endian lewat mmap")
+    p.add_argument("--from", dest="src", type=str.upper, choices=list(SKALA),
+                   help="Skala asal (default: dari header)")
+    p.add_argument("--to", dest="dst", required=True, type=str.upper, choices=list(SKALA))
+    p.add_argument("--dtype", choices=["f4", "f8"], help="Tipe data (default: dari header)")
+    p.add_argument("-o", "--output", help="File output (default: konversi in-place)")
+    p.add_argument("input", help="File dump biner")
+
+    p = sub.add_parser("calibrate", help="Pilih biaya hash password tertinggi untuk target latensi login")
+    p.add_argument("--target-ms", type=float, default=50)
+    p.add_argument("--algorithm", choices=["pbkdf2_sha256", "scrypt"], default="pbkdf2_sha256")
+    p.add_argument("--db", default="users.db", help="Database tujuan untuk --save")
+    p.add_argument("--save", action="store_true", help="Simpan parameter ke database")
+
+    p = sub.add_parser("serve", help="Jalankan server HTTP/JSON untuk konversi")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8080)
+    p.add_argument("--db", default="users.db")
+    p.add_argument("--workers", type=int, default=4, help="Thread untuk verifikasi password")
+    p.add_argument("--history", action="store_true", help="Catat setiap konversi ke riwayat user")
+    p.add_argument("--lockout", type=float, default=0, metavar="DETIK",
+                   help="Kunci username yang melewati batas percobaan login selama DETIK (disimpan di DB)")
+
+    p = sub.add_parser("history", help="Tampilkan riwayat konversi seorang user")
+    p.add_argument("username")
+    p.add_argument("--since", type=_waktu_arg, help="Awal rentang (ISO 8601 atau epoch detik)")
+    p.add_argument("--until", type=_waktu_arg, help="Akhir rentang, eksklusif")
+    p.add_argument("--limit", type=int, default=50)
+    p.add_argument("--stats", action="store_true", help="Tampilkan ringkasan per skala tujuan")
+    p.add_argument("--db", default="users.db")
+
+    p = sub.add_parser("import-users", help="Registrasi massal user dari CSV/JSONL")
+    p.add_argument("input", nargs="?", default="-", help="File input (default: stdin)")
+    p.add_argument("--format", choices=["csv", "jsonl"], help="Default: dari ekstensi file")
+    p.add_argument("--db", default="users.db")
+    p.add_argument("--chunk", type=int, default=500, help="Baris per transaksi")
+    p.add_argument("--workers", type=int, default=4, help="Thread untuk hashing password")
+
+    p = sub.add_parser("export-users", help="Ekspor daftar user (tanpa password) ke CSV/JSONL")
+    p.add_argument("-o", "--output", default="-", help="File output (default: stdout)")
+    p.add_argument("--format", choices=["csv", "jsonl"], help="Default: dari ekstensi file")
+    p.add_argument("--db", default="users.db")
+    return parser
+
+def cli(argv):
+    args = buat_parser().parse_args(argv)
+    if not (args.metrics or args.profile or args.tracemalloc):
+        return jalankan_perintah(args)
+
+    import Metrics
+    if args.metrics:
+        Metrics.aktifkan()
+    try:
+        if args.profile or args.tracemalloc:
+            with Metrics.profil_sesi(args.profile, args.tracemalloc):
+                return jalankan_perintah(args)
+        return jalankan_perintah(args)
+    finally:
+        if args.metrics:
+            Metrics.tulis_snapshot(args.metrics)
+
+def jalankan_perintah(args):
+    if args.perintah is None:
+        login_screen()
+
+    elif args.perintah == "convert":
+        from Pipeline import konversi_file, laporan
+        from Statistik import Agregat
+        try:
+            agregat = Agregat(args.dst, args.bin_width) if args.stats else None
+            memo = KonversiMemo(args.cache) if args.cache else None
+            baris, dilewati, detik = konversi_file(args.input, args.output, args.src, args.dst,
+                                                   args.column, args.format, args.precision,
+                                                   args.workers, memo, agregat)
+        except (OSError, ValueError) as e:
+            print(f"✗ {e}", file=sys.stderr)
+            return 1
+        laporan(baris, dilewati, detik, memo=memo)
+        if agregat is not None:
+            import json
+            teks = json.dumps(agregat.ringkasan(), indent=2)
+            if args.stats == "-":
+                print(teks, file=sys.stderr)
+            else:
+                with open(args.stats, "w", encoding="utf-8") as f:
+                    f.write(teks + "\n")
+
+    elif args.perintah == "binary":
+        from BinaryDump import konversi_biner
+        try:
+            jumlah = konversi_biner(args.input, args.dst, args.src, args.dtype, args.output)
+        except (OSError, ValueError) as e:
+            print(f"✗ {e}", file=sys.stderr)
+            return 1
+        print(f"✓ {jumlah} nilai dikonversi", file=sys.stderr)
+
+    elif args.perintah == "calibrate":
+        from Hashing import kalibrasi, ukur_ms
+        hasher = kalibrasi(args.target_ms, args.algorithm)
+        print(f"{hasher.spesifikasi}  ({ukur_ms(hasher):.1f} ms per hash, target {args.target_ms:g} ms)")
+        if args.save:
+            from Login import LoginDatabase
+            db = LoginDatabase(args.db)
+            db.set_setting("password_hasher", hasher.spesifikasi)
+            db.close()
+            print(f"✓ Parameter disimpan ke {args.db}. Hash lama diperbarui saat login berikutnya.")
+
+    elif args.perintah == "import-users":
+        from Login import AuthSystem, LoginDatabase, baca_users
+        from Pipeline import buka_masuk, deteksi_format
+        db = LoginDatabase(args.db)
+        masuk = buka_masuk(args.input)
+        mulai = time.perf_counter()
+        try:
+            users = baca_users(masuk, args.format or deteksi_format(args.input))
+            hasil = AuthSystem(db).register_many(users, args.chunk, args.workers)
+        finally:
+            if masuk is not sys.stdin:
+                masuk.close()
+            db.close()
+        for nomor, username, alasan in hasil["konflik"]:
+            print(f"✗ baris {nomor} ({username}): {alasan}", file=sys.stderr)
+        print(f"✓ {hasil['berhasil']} user diimpor, {len(hasil['konflik'])} konflik "
+              f"dalam {time.perf_counter() - mulai:.2f} detik", file=sys.stderr)
+
+    elif args.perintah == "export-users":
+        from Login import AuthSystem, LoginDatabase, export_users
+        from Pipeline import buka_keluar, deteksi_format
+        db = LoginDatabase(args.db)
+        keluar = buka_keluar(args.output)
+        try:
+            jumlah = export_users(AuthSystem(db), keluar, args.format or deteksi_format(args.output))
+            keluar.flush()
+        finally:
+            if keluar is not sys.stdout:
+                keluar.close()
+            db.close()
+        print(f"✓ {jumlah} user diekspor", file=sys.stderr)
+
+    elif args.perintah == "history":
+        from datetime import datetime
+        from Login import SQL_LOGIN, LoginDatabase
+        from Riwayat import RiwayatKonversi
+        db = LoginDatabase(args.db)
+        try:
+            user = db.conn.execute(SQL_LOGIN, (args.username,)).fetchone()
+            if user is None:
+                print(f"✗ User tidak ditemukan: {args.username}", file=sys.stderr)
+                return 1
+            riwayat = RiwayatKonversi(db)
+            if args.stats:
+                for dst, r in riwayat.ringkasan(user[0], args.since, args.until).items():
+                    print(f"{dst:<3} {r['count']:>10} konversi  min {r['min']:.2f}  max {r['max']:.2f}  "
+                          f"mean {r['mean']:.2f}  stddev {r['stddev']:.2f}")
+            else:
+                for ts, src, dst, nilai, hasil in riwayat.riwayat(user[0], args.since, args.until, args.limit):
+                    waktu = datetime.fromtimestamp(ts).isoformat(" ", "seconds")
+                    print(f"{waktu}  {nilai:g}{SKALA[src].simbol} = {hasil:.2f}{SKALA[dst].simbol}")
+        finally:
+            db.close()
+
+    elif args.perintah == "serve":
+        from Login import AuthSystem, LoginDatabase, LoginLimiter
+        from Riwayat import RiwayatKonversi
+        from Server import jalankan
+        db = LoginDatabase(args.db)
+        try:
+            riwayat = RiwayatKonversi(db) if args.history else None
+            jalankan(AuthSystem(db, limiter=LoginLimiter(), lockout=args.lockout), args.host, args.port, args.workers, riwayat)
+        finally:
+            db.close()
+    return 0
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv:
+        return cli(argv)
     login_screen()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # Import lazy "SuhuConverter" (Metrics, Pipeline, Login) memakai modul yang sama, bukan salinan kedua
+    sys.modules.setdefault("SuhuConverter", sys.modules[__name__])
+    sys.exit(main())
\ No newline at end of file